@@ -0,0 +1,70 @@
+"""
+Micro-benchmark: description cleaning per feed entry
+
+Compares the old BeautifulSoup(html, 'html.parser').get_text() path with
+routes.social.html_text.html_to_text on both backends, using the feed
+fixtures in benchmarks/fixtures.
+
+    cd fastapi && python benchmarks/bench_descriptions.py [--rounds N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+from routes.social.html_text import html_to_text, etree  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def soup_text(html: str, limit: int = 200) -> str:
+    return BeautifulSoup(html, 'html.parser').get_text().strip()[:limit]
+
+
+def load_descriptions():
+    """Load the raw description/summary HTML of every fixture entry"""
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURES)):
+        with open(os.path.join(FIXTURES, name), "rb") as f:
+            feed = feedparser.parse(f.read())
+        fixtures[name] = [
+            entry.get("description") or entry.get("summary") or ""
+            for entry in feed.entries
+        ]
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    candidates = {
+        "bs4 html.parser": soup_text,
+        "stream html.parser": lambda html: html_to_text(html, 200, "html.parser"),
+    }
+    if etree is not None:
+        candidates["stream lxml"] = lambda html: html_to_text(html, 200, "lxml")
+
+    for name, descriptions in load_descriptions().items():
+        size = sum(len(d) for d in descriptions) / max(len(descriptions), 1)
+        print(f"\n{name}: {len(descriptions)} entries, avg {size / 1024:.1f} KiB of HTML")
+
+        # Sanity check: every backend must agree with the old output
+        expected = [soup_text(d) for d in descriptions]
+        for label, fn in candidates.items():
+            mismatches = sum(fn(d) != e for d, e in zip(descriptions, expected))
+            seconds = timeit.timeit(
+                lambda: [fn(d) for d in descriptions], number=args.rounds
+            )
+            per_entry = seconds / (args.rounds * max(len(descriptions), 1)) * 1e6
+            print(f"  {label:<20} {per_entry:9.1f} µs/entry   mismatches={mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Load script: concurrent subscribers on the /api/stream SSE endpoint
+
+Opens N Server-Sent Events connections against a running backend, holds them
+for a while and reports how many connected, how long that took, how many
+frames each one received, and (with --pid) the server's resident memory
+before and after.
+
+    uvicorn main:app --port 8000 &
+    cd fastapi && python benchmarks/load_stream.py --subscribers 1000 --duration 30 --pid $!
+
+Run the server with a short STREAM_HEARTBEAT_SECONDS to see frames flowing
+on an otherwise idle feed, or pass --refresh to force a feed refresh midway.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def resident_kb(pid: int) -> int:
+    """VmRSS of a local process, in kB (Linux only)"""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+async def subscriber(client: httpx.AsyncClient, url: str, ready: asyncio.Event,
+                     stop: asyncio.Event, stats: dict):
+    started = time.perf_counter()
+    frames = 0
+    try:
+        async with client.stream("GET", url) as response:
+            if response.status_code != 200:
+                stats["rejected"] += 1
+                return
+            async for line in response.aiter_lines():
+                if line.startswith("event: ready"):
+                    stats["connect_times"].append(time.perf_counter() - started)
+                    ready.set()
+                elif line.startswith("event:") or line.startswith(": ping"):
+                    frames += 1
+                if stop.is_set():
+                    break
+    except httpx.HTTPError:
+        stats["errors"] += 1
+    except asyncio.CancelledError:
+        pass
+    finally:
+        stats["frames"].append(frames)
+
+
+async def main(args):
+    url = f"{args.base_url}/api/stream?topics={args.topics}"
+    if args.categories:
+        url += f"&categories={args.categories}"
+
+    stats = {"connect_times": [], "frames": [], "rejected": 0, "errors": 0}
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=args.subscribers + 10, max_keepalive_connections=0)
+    rss_before = resident_kb(args.pid) if args.pid else 0
+
+    async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(None, connect=30)) as client:
+        readies = [asyncio.Event() for _ in range(args.subscribers)]
+        tasks = [
+            asyncio.create_task(subscriber(client, url, ready, stop, stats))
+            for ready in readies
+        ]
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.gather(*(ready.wait() for ready in readies)), timeout=args.duration)
+        except asyncio.TimeoutError:
+            pass  # Rejected or failed subscribers never become ready
+        all_connected = time.perf_counter() - started
+        rss_connected = resident_kb(args.pid) if args.pid else 0
+
+        if args.refresh:
+            await client.post(f"{args.base_url}/api/social/feed/refresh")
+        await asyncio.sleep(args.duration)
+
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    connected = len(stats["connect_times"])
+    print(f"subscribers: {connected}/{args.subscribers} connected in {all_connected:.2f}s "
+          f"(rejected {stats['rejected']}, errors {stats['errors']})")
+    if connected:
+        times = sorted(stats["connect_times"])
+        print(f"connect time: median {statistics.median(times) * 1000:.1f}ms, "
+              f"p99 {times[int(len(times) * 0.99) - 1] * 1000:.1f}ms")
+    print(f"frames per subscriber: min {min(stats['frames'])}, max {max(stats['frames'])}")
+    if args.pid:
+        per_sub = (rss_connected - rss_before) / max(connected, 1)
+        print(f"server RSS: {rss_before} kB idle, {rss_connected} kB connected "
+              f"(~{per_sub:.1f} kB per subscriber)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--topics", default="feed,weather")
+    parser.add_argument("--categories", default=None)
+    parser.add_argument("--refresh", action="store_true", help="POST a feed refresh once everyone is connected")
+    parser.add_argument("--pid", type=int, default=None, help="Server PID to sample resident memory from")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,325 @@
+import asyncio
+import logging
+import re
+import time
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from core.metrics import metrics
+from core.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from core.cache_backends import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+_WHITESPACE = re.compile(r"\s+")
+_COMMA_SPACING = re.compile(r"\s*,\s*")
+
+
+def normalize_key(key: Hashable) -> Hashable:
+    """Case- and whitespace-insensitive form of a cache key
+
+    " New  York , US" and "new york,us" map to the same entry. Tuples are
+    normalized element-wise; other key types are returned unchanged.
+    """
+    if isinstance(key, str):
+        return _COMMA_SPACING.sub(",", _WHITESPACE.sub(" ", key.strip().lower()))
+    if isinstance(key, tuple):
+        return tuple(normalize_key(part) for part in key)
+    return key
+
+
+# Every live LRUCache, so their sizes and evictions can be reported by name
+_caches: "weakref.WeakSet[LRUCache]" = weakref.WeakSet()
+
+
+def _cache_stat(field: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    def collect():
+        values: Dict[Tuple[str, ...], float] = {}
+        for cache in list(_caches):
+            values[(cache.name,)] = values.get((cache.name,), 0) + cache.stats()[field]
+        return values
+    return collect
+
+
+metrics.gauge("cache_entries", "Items held per cache", ["cache"], collect=_cache_stat("size"))
+metrics.counter("cache_evictions_total", "Items evicted to stay within max_entries", ["cache"],
+                collect=_cache_stat("evictions"))
+metrics.counter("cache_expirations_total", "Items dropped after max_age", ["cache"],
+                collect=_cache_stat("expirations"))
+CACHE_REQUESTS = metrics.counter(
+    "cache_requests_total",
+    "Cache lookups per key family by result (hit, stale, miss)",
+    ["cache", "family", "result"]
+)
+CACHE_FALLBACKS = metrics.counter(
+    "cache_fallbacks_total",
+    "Last good values served because loading failed",
+    ["cache", "family"]
+)
+
+
+class LRUCache:
+    """Size- and age-bounded LRU map with normalized keys and hit/miss counters.
+
+    Holds at most ``max_entries`` items, evicting the least recently used one
+    on overflow. Items older than ``max_age`` seconds are dropped lazily on
+    access and by a periodic sweep, so entries keyed by arbitrary user input
+    cannot grow memory without bound.
+    """
+
+    _SWEEP_EVERY = 128
+
+    def __init__(self, max_entries: int = 1024, max_age: Optional[float] = None,
+                 normalize: bool = True, name: str = "cache"):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.normalize = normalize
+        self.name = name
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _caches.add(self)
+
+    def _key(self, key: Hashable) -> Hashable:
+        return normalize_key(key) if self.normalize else key
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value without touching recency or counters"""
+        item = self._data.get(self._key(key))
+        if item is None or (item[1] is not None and item[1] <= time.monotonic()):
+            return default
+        return item[0]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        key = self._key(key)
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        if item[1] is not None and item[1] <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def set(self, key: Hashable, value: Any, max_age: Optional[float] = None):
+        key = self._key(key)
+        max_age = self.max_age if max_age is None else max_age
+        expires_at = time.monotonic() + max_age if max_age is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+        self._writes += 1
+        if self._writes % self._SWEEP_EVERY == 0:
+            self.purge_expired()
+
+    def delete(self, key: Hashable):
+        self._data.pop(self._key(key), None)
+
+    def clear(self):
+        self._data.clear()
+
+    def purge_expired(self) -> int:
+        """Drop every expired item; returns how many were removed"""
+        now = time.monotonic()
+        expired = [k for k, (_, expires_at) in self._data.items()
+                   if expires_at is not None and expires_at <= now]
+        for k in expired:
+            del self._data[k]
+        self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+class CacheEntry:
+    """A cached value with separate fresh and stale-usable windows.
+
+    Times are wall-clock so entries can be shared between replicas.
+    """
+
+    __slots__ = ("value", "stored_at", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_ttl: float, stale_ttl: float, stored_at: Optional[float] = None):
+        self.value = value
+        self.stored_at = stored_at or time.time()
+        self.fresh_until = self.stored_at + fresh_ttl
+        self.stale_until = self.stored_at + fresh_ttl + stale_ttl
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.fresh_until
+
+    def is_usable(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.stale_until
+
+
+class SWRCache:
+    """Stale-while-revalidate cache with single-flight loading.
+
+    - fresh entries are returned as-is
+    - stale-but-usable entries are returned immediately while one background
+      revalidation refreshes them
+    - missing or expired entries are loaded once, shared by concurrent callers
+    - if loading fails, the last good value is served as long as it is
+      still retained (``max_age``, defaulting to the end of the stale window)
+      and treated as fresh for ``retry_after`` seconds, so during an outage
+      callers get it back at once instead of each waiting out the upstream
+      timeout; after that one background revalidation per ``retry_after``
+      tries upstream again
+
+    Entries live in a bounded LRUCache, so keys are normalized and the
+    number of retained entries is capped at ``max_entries``. With a shared
+    ``backend`` the local cache acts as an L1: before going upstream a load
+    first adopts a fresh value another replica already published, and every
+    upstream result is published back.
+    """
+
+    def __init__(self, fresh_ttl: float, stale_ttl: float, name: str = "cache",
+                 max_entries: int = 1024, max_age: Optional[float] = None,
+                 backend: Optional["CacheBackend"] = None, retry_after: float = 30.0):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.retry_after = retry_after
+        self.name = name
+        self.backend = backend
+        self.max_age = max(max_age or 0, fresh_ttl + stale_ttl)
+        self._entries = LRUCache(
+            max_entries=max_entries,
+            max_age=self.max_age,
+            name=name
+        )
+        self._inflight = SingleFlight()
+        self._revalidations: Set[asyncio.Task] = set()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                           family: Optional[str] = None) -> Any:
+        """Return the cached value for ``key``, loading or revalidating it with ``fetch``
+
+        ``family`` groups keys of one kind (e.g. "forecast") in the metrics.
+        """
+        key = normalize_key(key)
+        family = family or self.name
+        entry = self._entries.get(key)
+        now = time.time()
+
+        if entry is not None and entry.is_fresh(now):
+            CACHE_REQUESTS.inc(cache=self.name, family=family, result="hit")
+            return entry.value
+
+        if entry is not None and entry.is_usable(now):
+            CACHE_REQUESTS.inc(cache=self.name, family=family, result="stale")
+            self._revalidate(key, fetch, family)
+            return entry.value
+
+        CACHE_REQUESTS.inc(cache=self.name, family=family, result="miss")
+        return await self._inflight.do(key, lambda: self._load(key, fetch, family))
+
+    def _backend_key(self, key: Hashable) -> str:
+        return f"{self.name}:{key}"
+
+    async def _load(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], family: str) -> Any:
+        shared = None
+        if self.backend is not None:
+            try:
+                shared = await self.backend.get(self._backend_key(key))
+            except Exception as e:
+                logger.warning(f"{self.name}: shared cache read failed for {key}: {e}")
+
+            # Another replica already fetched it recently
+            if shared and time.time() < shared["stored_at"] + self.fresh_ttl:
+                self._entries.set(key, CacheEntry(shared["value"], self.fresh_ttl, self.stale_ttl, shared["stored_at"]))
+                return shared["value"]
+
+        try:
+            value = await fetch()
+        except Exception:
+            # Serve the last good value through upstream outages, ours or
+            # another replica's, whichever is newer
+            last = self._entries.peek(key)
+            if shared and (last is None or shared["stored_at"] > last.stored_at):
+                last = CacheEntry(shared["value"], 0, 0, shared["stored_at"])
+            if last is None:
+                raise
+            CACHE_FALLBACKS.inc(cache=self.name, family=family)
+            logger.warning(f"{self.name}: serving last good value for {key} after fetch failure")
+            self._hold(key, last)
+            return last.value
+
+        entry = CacheEntry(value, self.fresh_ttl, self.stale_ttl)
+        self._entries.set(key, entry)
+
+        if self.backend is not None:
+            try:
+                await self.backend.set(
+                    self._backend_key(key),
+                    {"value": value, "stored_at": entry.stored_at},
+                    ttl=self.max_age
+                )
+            except Exception as e:
+                logger.warning(f"{self.name}: shared cache write failed for {key}: {e}")
+        return value
+
+    def _hold(self, key: Hashable, entry: CacheEntry):
+        """
+        Re-store a last good value after a failed load: fresh for
+        ``retry_after`` (no upstream calls), then stale for as long again
+        (one background retry). It still expires ``max_age`` after it was
+        first stored.
+        """
+        now = time.time()
+        expires_in = entry.stored_at + self.max_age - now
+        if expires_in <= 0:
+            return
+        held = CacheEntry(entry.value, now - entry.stored_at + self.retry_after, self.retry_after, entry.stored_at)
+        self._entries.set(key, held, max_age=expires_in)
+
+    def _revalidate(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], family: str):
+        if key in self._inflight:
+            return
+        task = asyncio.create_task(self._background_load(key, fetch, family))
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+    async def _background_load(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], family: str):
+        try:
+            await self._inflight.do(key, lambda: self._load(key, fetch, family))
+        except Exception as e:
+            logger.warning(f"{self.name}: background revalidation failed for {key}: {e}")
@@ -0,0 +1,234 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional
+    aioredis = None
+
+
+class CacheBackend:
+    """Interface for caches shared between replicas.
+
+    Values must be JSON-serializable. ``ttl`` is in seconds; ``None`` keeps the
+    value until it is overwritten or deleted. ``incr`` backs cluster-wide
+    generation counters used for invalidation.
+    """
+
+    name = "backend"
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process backend; the default for single-replica and local runs"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 4096):
+        self._cache = LRUCache(max_entries=max_entries, normalize=False, name="shared")
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._cache.set(key, value, max_age=ttl)
+
+    async def delete(self, key: str):
+        self._cache.delete(key)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._cache.peek(key, 0)) + 1
+        self._cache.set(key, value)
+        return value
+
+
+class FileCacheBackend(CacheBackend):
+    """Directory-backed backend shared by every process that mounts the path.
+
+    One JSON file per key, written atomically via rename. Works across
+    workers on one host or across pods sharing a volume, and is easy to run
+    locally (``CACHE_BACKEND_URL=file:///tmp/k8s-dashboard-cache``).
+
+    Expired files are deleted when read. Every ``_SWEEP_EVERY`` writes the
+    directory is trimmed back to ``max_entries`` (CACHE_FILE_MAX_ENTRIES,
+    default 4096) by deleting the least recently written entries that have
+    a TTL, so keys taken from user input cannot fill the volume. Entries
+    without a TTL (generation counters) are never evicted.
+    """
+
+    name = "file"
+
+    _SWEEP_EVERY = 64
+
+    def __init__(self, directory: str, max_entries: Optional[int] = None):
+        self.directory = directory
+        self.max_entries = max_entries or int(os.getenv("CACHE_FILE_MAX_ENTRIES", "4096"))
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    @staticmethod
+    def _load(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _read(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        item = self._load(path)
+        if item is None:
+            return None
+        if item.get("expires_at") is not None and item["expires_at"] <= time.time():
+            Path(path).unlink(missing_ok=True)
+            return None
+        return item.get("value")
+
+    def _write(self, key: str, value: Any, ttl: Optional[float]):
+        item = {
+            "key": key,
+            "value": value,
+            "expires_at": time.time() + ttl if ttl is not None else None
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(item, f, separators=(",", ":"))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._writes += 1
+        if self._writes % self._SWEEP_EVERY == 0:
+            self.trim()
+
+    def trim(self) -> int:
+        """Delete the oldest entries with a TTL beyond max_entries; returns how many were removed"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        continue
+        if len(entries) <= self.max_entries:
+            return 0
+
+        excess = len(entries) - self.max_entries
+        removed = 0
+        entries.sort()
+        for _, path in entries:
+            if removed >= excess:
+                break
+            item = self._load(path)
+            if item is not None and item.get("expires_at") is None:
+                continue
+            Path(path).unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def _incr(self, key: str) -> int:
+        lock_path = self._path(key) + ".lock"
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                value = int(self._read(key) or 0) + 1
+                self._write(key, value, None)
+                return value
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await asyncio.to_thread(self._write, key, value, ttl)
+
+    async def delete(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def incr(self, key: str) -> int:
+        return await asyncio.to_thread(self._incr, key)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Networked backend shared by all replicas (requires the ``redis`` package)"""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "k8s-dashboard:"):
+        if aioredis is None:
+            raise RuntimeError("CACHE_BACKEND_URL uses redis:// but the redis package is not installed")
+        self.prefix = prefix
+        self._client = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ex = max(1, int(ttl)) if ttl is not None else None
+        await self._client.set(self.prefix + key, json.dumps(value, separators=(",", ":")), ex=ex)
+
+    async def delete(self, key: str):
+        await self._client.delete(self.prefix + key)
+
+    async def incr(self, key: str) -> int:
+        return int(await self._client.incr(self.prefix + key))
+
+    async def close(self):
+        close = getattr(self._client, "aclose", None) or self._client.close
+        await close()
+
+
+def create_cache_backend(url: Optional[str] = None) -> CacheBackend:
+    """Build a backend from a URL: memory://, file:///path or redis://host:port/db"""
+    url = url or "memory://"
+    scheme = urlsplit(url).scheme
+    if scheme == "file":
+        return FileCacheBackend(urlsplit(url).path)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisCacheBackend(url)
+    if scheme != "memory":
+        logger.warning(f"Unknown cache backend {url!r}, falling back to memory")
+    return MemoryCacheBackend()
+
+
+cache_backend = create_cache_backend(os.getenv("CACHE_BACKEND_URL"))
@@ -0,0 +1,136 @@
+import gzip
+import os
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+# Bodies smaller than this go out uncompressed (same as nginx gzip_min_length)
+MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+ZSTD_LEVEL = int(os.getenv("COMPRESS_ZSTD_LEVEL", "10"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/css", "application/javascript")
+
+
+def _gzip(body: bytes) -> bytes:
+    # Fixed mtime keeps the output, and so its ETag, the same on every replica
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+# Content codings we can produce, in order of preference when the client
+# accepts several equally
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {}
+if brotli is not None:
+    ENCODERS["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+if zstandard is not None:
+    ENCODERS["zstd"] = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+ENCODERS["gzip"] = _gzip
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """The supported coding an Accept-Encoding header prefers, or None for identity"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        weight = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for coding in ENCODERS:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    return ENCODERS[coding](body)
+
+
+def variant_etag(etag: str, coding: str) -> str:
+    """Strong ETag of a compressed representation; each coding needs its own"""
+    return f'{etag[:-1]}-{coding}"'
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses the routes did not compress themselves
+
+    Cached reads come out of core.responses already encoded, with their
+    compressed variants stored next to the identity body, and are passed
+    through untouched. So are responses that already vary on
+    Accept-Encoding, event streams and other streaming bodies, and
+    non-text content. Everything else (e.g. /api/social/feed/sources) is
+    compressed once per response with the coding the client prefers.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if ("content-encoding" in headers
+                        or "accept-encoding" in headers.get("vary", "").lower()
+                        or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the headers until the body shows whether it is worth compressing
+                    start = message
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            passthrough = True
+            if coding is None or message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, coding)
+            headers["Content-Encoding"] = coding
+            headers["Content-Length"] = str(len(body))
+            if "etag" in headers:
+                headers["ETag"] = variant_etag(headers["etag"], coding)
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,46 @@
+import hashlib
+import secrets
+from typing import Any, Optional
+
+# Dataset version counters start over with every process and mean different
+# things on different replicas, so ETags built from them are salted with an
+# id unique to this process. A client that switches replicas gets a 200
+# instead of a wrong 304.
+_PROCESS_ID = secrets.token_hex(8)
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag identifying a response by what it was built from
+
+    `parts` must pin down the body completely, e.g. a reading's fetch time plus
+    the request parameters. Nothing here looks at the body itself.
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def version_etag(version: Any, *parts: Any) -> str:
+    """Strong ETag for a view of an in-process dataset version"""
+    return make_etag(_PROCESS_ID, version, *parts)
+
+
+def cache_control(max_age: int) -> str:
+    return f"public, max-age={max_age}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check, using weak comparison as RFC 9110 requires
+
+    Proxies that compress a response (nginx gzip) weaken its ETag, so a
+    W/-prefixed tag still matches our strong one.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
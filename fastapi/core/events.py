@@ -0,0 +1,97 @@
+import asyncio
+import json
+import logging
+from typing import Any, Optional, Set
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def encode_sse(event: str, data: Any, event_id: Optional[str] = None) -> bytes:
+    """Encode one Server-Sent Events frame"""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+RESYNC_FRAME = encode_sse("resync", {"reason": "subscriber fell behind"})
+
+
+class Subscription:
+    """One connected client: a bounded queue of pre-encoded frames plus its filters"""
+
+    def __init__(self, topics: Set[str], keys: Optional[Set[str]], maxsize: int):
+        self.topics = topics
+        self.keys = keys
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def wants(self, topic: str, key: Optional[str]) -> bool:
+        # Unkeyed events (weather) go to every subscriber of the topic
+        if topic not in self.topics:
+            return False
+        return self.keys is None or key is None or key in self.keys
+
+    def offer(self, frame: bytes):
+        """Enqueue without ever blocking the publisher.
+
+        A subscriber whose queue is full is too slow to keep up: its backlog is
+        replaced by a single resync frame telling the client to refetch.
+        """
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME)
+
+
+class EventBroker:
+    """In-process pub/sub fan-out for streaming endpoints.
+
+    Payloads are encoded once per publish, not once per subscriber, and every
+    subscriber has a bounded queue, so a slow client costs at most
+    ``maxsize`` frames of memory and never stalls the publisher.
+    """
+
+    def __init__(self):
+        self._subscriptions: Set[Subscription] = set()
+        self.published = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def has_subscribers(self, topic: str) -> bool:
+        return any(topic in subscription.topics for subscription in self._subscriptions)
+
+    def subscribe(self, topics: Set[str], keys: Optional[Set[str]] = None, maxsize: int = 64) -> Subscription:
+        subscription = Subscription(topics, keys, maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, topic: str, event: str, data: Any, key: Optional[str] = None, event_id: Optional[str] = None):
+        """Fan an event out to every matching subscriber"""
+        if not self._subscriptions:
+            return
+        frame = encode_sse(event, data, event_id)
+        self.published += 1
+        for subscription in list(self._subscriptions):
+            if subscription.wants(topic, key):
+                subscription.offer(frame)
+
+
+event_broker = EventBroker()
+
+metrics.gauge("stream_subscribers", "Connected stream clients",
+              collect=lambda: {(): event_broker.subscriber_count})
+metrics.counter("stream_events_published_total", "Events fanned out to stream clients",
+                collect=lambda: {(): event_broker.published})
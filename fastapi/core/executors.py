@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ParseExecutor:
+    """Runs CPU-bound parsing off the event loop.
+
+    ``PARSE_EXECUTOR`` selects the backend: ``thread`` (default), ``process``
+    for true parallelism across cores, or ``inline`` to run on the loop.
+    ``PARSE_WORKERS`` sets the pool size. Work submitted to the process pool
+    must be a picklable module-level function.
+    """
+
+    def __init__(self):
+        self.kind = os.getenv("PARSE_EXECUTOR", "thread").lower()
+        self.max_workers = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self._executor: Optional[Executor] = None
+
+    def _build_executor(self) -> Optional[Executor]:
+        if self.kind == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        if self.kind == "thread":
+            return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="parse")
+        return None
+
+    async def start(self):
+        """Create the worker pool (called from main.lifespan)"""
+        if self._executor is None:
+            self._executor = self._build_executor()
+            logger.info(f"Parse executor started ({self.kind}, workers={self.max_workers})")
+
+    async def close(self):
+        """Shut the worker pool down (called from main.lifespan)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result"""
+        if self.kind == "inline":
+            return fn(*args, **kwargs)
+        if self._executor is None:
+            self._executor = self._build_executor()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+
+parse_executor = ParseExecutor()
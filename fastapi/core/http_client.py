@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_IN_FLIGHT = metrics.gauge(
+    "upstream_requests_in_flight",
+    "Outbound requests holding a per-host slot",
+    ["host"]
+)
+UPSTREAM_REQUESTS = metrics.counter(
+    "upstream_requests_total",
+    "Outbound requests by host and HTTP status (\"error\" when none was received)",
+    ["host", "status"]
+)
+UPSTREAM_SECONDS = metrics.histogram(
+    "upstream_request_duration_seconds",
+    "Outbound request time, including reading streamed bodies",
+    ["host"]
+)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class SharedHttpClient:
+    """App-wide pooled httpx client shared by every outbound fetch.
+
+    Keeps connections alive across requests so repeated fetches to the same
+    feed and weather hosts skip the TCP+TLS handshake, negotiates HTTP/2 when
+    available, and caps concurrent connections per upstream host.
+    """
+
+    def __init__(self):
+        self.timeout = float(os.getenv("HTTP_CLIENT_TIMEOUT", "10"))
+        self.max_connections = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "20"))
+        self.keepalive_expiry = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "60"))
+        self.per_host_limit = int(os.getenv("HTTP_CLIENT_PER_HOST_LIMIT", "4"))
+        self.http2 = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true" and _http2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            http2=self.http2,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            headers={"User-Agent": "k8s-dashboard/0.1 (+https://command.dulc3.tech)"}
+        )
+
+    async def start(self):
+        """Create the pooled client (called from main.lifespan)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+            logger.info(f"Shared HTTP client started (http2={self.http2})")
+
+    async def close(self):
+        """Close pooled connections (called from main.lifespan)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._host_limits.clear()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the pooled client, creating it lazily outside the app lifespan"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    @asynccontextmanager
+    async def _slot(self, url: str) -> AsyncIterator[Dict[str, str]]:
+        """Hold the host's connection slot and record the request; set the yielded "status" once known"""
+        host = urlsplit(url).netloc
+        async with self._host_semaphore(host):
+            outcome = {"status": "error"}
+            UPSTREAM_IN_FLIGHT.inc(host=host)
+            started = time.perf_counter()
+            try:
+                yield outcome
+            finally:
+                UPSTREAM_IN_FLIGHT.dec(host=host)
+                UPSTREAM_REQUESTS.inc(host=host, status=outcome["status"])
+                UPSTREAM_SECONDS.observe(time.perf_counter() - started, host=host)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the shared pool, respecting the per-host connection limit"""
+        async with self._slot(url) as outcome:
+            response = await self.client.get(url, **kwargs)
+            outcome["status"] = str(response.status_code)
+            return response
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Stream a response body through the shared pool (per-host limit held until closed)"""
+        async with self._slot(url) as outcome:
+            async with self.client.stream(method, url, **kwargs) as response:
+                outcome["status"] = str(response.status_code)
+                yield response
+
+
+http_client = SharedHttpClient()
@@ -0,0 +1,258 @@
+import asyncio
+import bisect
+import logging
+import math
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Starlette appends the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """
+    A named metric family with a fixed set of label names
+
+    Values live in a dict keyed by label values. `collect`, if given, is
+    called at scrape time instead and returns that dict itself. This suits
+    values other objects already track, like cache sizes.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 collect: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.collect = collect
+        self._values: Dict[LabelValues, float] = {}
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        values = self.collect() if self.collect is not None else self._values
+        for key, value in values.items():
+            yield self.name, self.labels, key, value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, label_names, label_values, value in self.samples():
+            lines.append(f"{name}{_format_labels(label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts with a trailing +Inf slot, sum)
+        self._observations: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        counts, total = self._observations.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self):
+        bucket_labels = self.labels + ("le",)
+        for key, (counts, total) in self._observations.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", bucket_labels, key + (_format_value(bound),), cumulative
+            yield f"{self.name}_sum", self.labels, key, total[0]
+            yield f"{self.name}_count", self.labels, key, cumulative
+
+
+class MetricsRegistry:
+    """Process-wide metric families, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = (),
+                collect: Optional[Callable[[], Dict[LabelValues, float]]] = None) -> Counter:
+        return self._register(Counter(name, documentation, labels, collect))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = (),
+              collect: Optional[Callable[[], Dict[LabelValues, float]]] = None) -> Gauge:
+        return self._register(Gauge(name, documentation, labels, collect))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # One broken collector must not take the whole scrape down
+                logger.warning(f"Failed to collect metric {metric.name}: {e}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time until the response headers were sent, per route template",
+    ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_FLIGHT = metrics.gauge(
+    "http_requests_in_flight",
+    "Requests being handled (streams count until their headers are sent)"
+)
+EVENT_LOOP_LAG = metrics.gauge(
+    "event_loop_lag_seconds",
+    "How late the last event-loop lag probe woke up"
+)
+EVENT_LOOP_LAG_SECONDS = metrics.histogram(
+    "event_loop_lag_probe_seconds",
+    "Event-loop lag probe delays",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+
+class MetricsMiddleware:
+    """Per-route request latency and in-flight request count
+
+    Routes are labelled by their template (/api/weather/local/{location}),
+    so the label set stays bounded. Requests that match no route are
+    labelled "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        observed = False
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        def observe(status: int):
+            nonlocal observed
+            observed = True
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status
+            )
+
+        async def send_with_metrics(message: Message):
+            if message["type"] == "http.response.start" and not observed:
+                observe(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            if not observed:
+                observe(500)
+
+
+class EventLoopMonitor:
+    """
+    Measures event-loop lag
+
+    A probe sleeps for `interval` and records how much later than that it
+    actually woke up. Anything blocking the loop (CPU-bound parsing, big
+    serializations) shows up as lag, which every request on this worker
+    also pays.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or float(os.getenv("METRICS_LOOP_LAG_INTERVAL", "0.5"))
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            EVENT_LOOP_LAG.set(lag)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+
+
+loop_monitor = EventLoopMonitor()
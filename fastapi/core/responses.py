@@ -0,0 +1,115 @@
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from core.cache import CACHE_REQUESTS, LRUCache
+from core.compression import MIN_SIZE, compress, negotiate, variant_etag
+from core.conditional import etag_matches
+from core.singleflight import SingleFlight
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def encode_json(content: Any) -> bytes:
+    """
+    Compact JSON bytes for a response body
+
+    Pydantic models are dumped by pydantic-core, which skips FastAPI's
+    jsonable_encoder pass. Plain data goes through orjson when it is
+    installed, and the standard library otherwise.
+    """
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class EncodedBody:
+    """An encoded response body and its compressed variants, each produced at most once"""
+
+    __slots__ = ("body", "_variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants: Dict[str, bytes] = {}
+
+    def variant(self, coding: str) -> bytes:
+        compressed = self._variants.get(coding)
+        if compressed is None:
+            compressed = self._variants[coding] = compress(self.body, coding)
+        return compressed
+
+
+class ResponseCache:
+    """
+    Encoded response bodies keyed by ETag
+
+    An ETag pins down a dataset version and the view of it, so the JSON for
+    it only has to be validated and encoded once. Later requests for the same
+    version get the stored bytes back as they are. Concurrent misses for one
+    ETag share a single build. Compressed variants are kept alongside and
+    made on first request, so each coding is compressed once per version.
+    Superseded versions are never asked for again and age out of the LRU.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_age: Optional[float] = None):
+        self._bodies = LRUCache(
+            max_entries=max_entries or int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")),
+            max_age=max_age or float(os.getenv("RESPONSE_CACHE_MAX_AGE", "900")),
+            normalize=False,
+            name="responses"
+        )
+        self._inflight = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    async def get_or_build(self, etag: str, build: Callable[[], Awaitable[Any]],
+                           family: str = "responses") -> EncodedBody:
+        """Encoded body for `etag`, building it with `build()` (a model or plain data) on a miss"""
+        body = self._bodies.get(etag)
+        CACHE_REQUESTS.inc(cache="responses", family=family, result="miss" if body is None else "hit")
+        if body is None:
+            body = await self._inflight.do(etag, lambda: self._build(etag, build))
+        return body
+
+    async def _build(self, etag: str, build: Callable[[], Awaitable[Any]]) -> EncodedBody:
+        body = EncodedBody(encode_json(await build()))
+        self._bodies.set(etag, body)
+        return body
+
+
+response_cache = ResponseCache()
+
+
+async def cached_json(request: Request, etag: str, cache_control: str,
+                      build: Callable[[], Awaitable[Any]]) -> Response:
+    """
+    Serve a read from its ETag
+
+    Answers If-None-Match with a 304. Otherwise returns the pre-encoded body
+    for this ETag in the coding the client prefers, and only builds, encodes
+    or compresses on a miss. Compressed representations get their own ETag.
+    """
+    coding = negotiate(request.headers.get("accept-encoding"))
+    headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    # A copy in either representation is still current
+    if_none_match = request.headers.get("if-none-match")
+    for candidate in ([variant_etag(etag, coding)] if coding else []) + [etag]:
+        if etag_matches(if_none_match, candidate):
+            return Response(status_code=304, headers=dict(headers, ETag=candidate))
+
+    route = request.scope.get("route")
+    encoded = await response_cache.get_or_build(etag, build, family=getattr(route, "path", "responses"))
+    if coding is None or len(encoded.body) < MIN_SIZE:
+        return Response(content=encoded.body, media_type="application/json", headers=dict(headers, ETag=etag))
+    headers.update({"ETag": variant_etag(etag, coding), "Content-Encoding": coding})
+    return Response(content=encoded.variant(coding), media_type="application/json", headers=headers)
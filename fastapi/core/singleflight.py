@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts the work; everyone arriving while it is
+    still running awaits the same result (or exception). The shared task is
+    shielded, so a waiter that gets cancelled - e.g. a client disconnecting -
+    does not cancel the fetch for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn()`` unless a call for ``key`` is already in flight, then share its result"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
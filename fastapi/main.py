@@ -1,20 +1,38 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 import os
-from routes.weather.weather_routes import router as weather_router
+from core.http_client import http_client
+from core.executors import parse_executor
+from core.cache_backends import cache_backend
+from core.compression import CompressionMiddleware
+from core.metrics import metrics, loop_monitor, MetricsMiddleware, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from routes.weather.weather_routes import router as weather_router, weather_service
 from routes.health.health_routes import router as health_router
-from routes.social.social_routes import router as social_router
+from routes.social.social_routes import router as social_router, feed_refresher, feed_snapshot
+from routes.stream.stream_routes import router as stream_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 FastAPI backend starting up...")
+    loop_monitor.start()
+    await http_client.start()
+    await parse_executor.start()
+    await feed_snapshot.load()
+    await feed_refresher.start()
+    weather_service.start()
     yield
     # Shutdown
     print("🛑 FastAPI backend shutting down...")
+    await feed_refresher.stop()
+    await weather_service.stop()
+    await parse_executor.close()
+    await http_client.close()
+    await cache_backend.close()
+    await loop_monitor.stop()
 
 
 app = FastAPI(
@@ -37,10 +55,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/brotli/zstd; cached reads arrive precompressed and pass through
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so request latency includes CORS and compression
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(health_router, prefix="/api", tags=["health"])
 app.include_router(weather_router, prefix="/api", tags=["weather"])
 app.include_router(social_router, prefix="/api/social", tags=["social"])
+app.include_router(stream_router, prefix="/api", tags=["stream"])
 
 
 @app.get("/")
@@ -52,6 +77,12 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (not proxied by nginx; scrape pods directly)"""
+    return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(
@@ -0,0 +1,355 @@
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+from datetime import datetime
+from itertools import islice
+import base64
+import heapq
+import os
+import sys
+import time
+from .search_index import SearchIndex
+
+# Position of an article in feed order: (published_ts, id), newest first
+OrderKey = Tuple[float, str]
+
+
+def order_key(article: Dict[str, Any]) -> OrderKey:
+    return (article["published_ts"], article.get("id", ""))
+
+
+def encode_cursor(key: OrderKey) -> str:
+    """Opaque pagination cursor for a position in feed order"""
+    raw = f"{key[0]!r}|{key[1]}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> OrderKey:
+    """Decode a cursor produced by encode_cursor; raises ValueError when malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, _, article_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").partition("|")
+        return (float(ts), article_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def parse_since(value: str) -> OrderKey:
+    """Parse a `since` value: epoch seconds, an ISO-8601 timestamp or a cursor"""
+    try:
+        return (float(value), "\uffff")
+    except ValueError:
+        pass
+    try:
+        since = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if since.tzinfo is not None:
+            since = since.replace(tzinfo=None) - since.utcoffset()
+        return ((since - datetime(1970, 1, 1)).total_seconds(), "\uffff")
+    except ValueError:
+        pass
+    return decode_cursor(value)
+
+
+class ArticleRecord:
+    """
+    Compact, read-only article
+
+    Stored instead of the parser's dicts: `__slots__` instead of a per-article
+    hash table, interned source/category/domain strings shared by every
+    article of a source, and the ISO `published` string derived on demand
+    from the numeric timestamp. Reads like a mapping (`article["title"]`,
+    `article.get(...)`, `dict(article)`) so views, search and trending take
+    records and parser dicts alike.
+    """
+
+    __slots__ = ("id", "digest", "fingerprint", "title", "description", "url",
+                 "source", "category", "domain", "published_ts")
+    FIELDS = __slots__ + ("published",)
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, article: Dict[str, Any]):
+        self.id = article.get("id", "")
+        self.digest = article.get("digest", "")
+        self.fingerprint = article.get("fingerprint", "")
+        self.title = article.get("title", "")
+        self.description = article.get("description", "")
+        self.url = article.get("url", "")
+        self.source = sys.intern(article.get("source", ""))
+        self.category = sys.intern(article.get("category", ""))
+        self.domain = sys.intern(article.get("domain", ""))
+        self.published_ts = self._timestamp(article)
+
+    @staticmethod
+    def _timestamp(article: Dict[str, Any]) -> float:
+        if article.get("published_ts") is not None:
+            return float(article["published_ts"])
+        # Articles stored before epoch timestamps were recorded
+        try:
+            published = datetime.fromisoformat(article["published"])
+            return (published - datetime(1970, 1, 1)).total_seconds()
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+
+    @classmethod
+    def from_article(cls, article) -> "ArticleRecord":
+        return article if isinstance(article, cls) else cls(article)
+
+    @property
+    def published(self) -> str:
+        return datetime.utcfromtimestamp(int(self.published_ts)).isoformat()
+
+    def __getitem__(self, key: str):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._FIELD_SET
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self._FIELD_SET else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+def _first_at_or_below(articles: List[ArticleRecord], key: OrderKey, inclusive: bool) -> int:
+    """Index of the first article ordered below `key` (or equal, if inclusive) in a newest-first run"""
+    lo, hi = 0, len(articles)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        current = order_key(articles[mid])
+        if current < key or (inclusive and current == key):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class ArticleStore:
+    """
+    Parsed articles keyed by source URL
+
+    Every category/limit combination is served as a merged view over the
+    per-source lists, so each source is fetched and held in memory once no
+    matter how many category combinations clients ask for.
+
+    Each source's articles are kept as a run sorted newest-first by numeric
+    `published_ts`, so a top-N view is a lazy k-way heap merge costing
+    O(limit * log sources) instead of a full sort per request.
+
+    A deduplication index tracks who first ingested each normalized URL and
+    title fingerprint, so a story syndicated by several sources shows up once
+    in every view (under the source that reported it first). Repeated titles
+    within one source are all kept.
+
+    History is retained across refreshes: each fetch is merged into the
+    source's run, which keeps articles for `retention` seconds
+    (FEED_RETENTION_DAYS, default 14), capped at `max_per_source`
+    (FEED_RETENTION_PER_SOURCE, default 500) and never trimmed below the
+    newest `keep_latest`, so slow sources don't age out entirely.
+
+    Memory budget: plan on 5 KB per retained article all-in (tracemalloc,
+    200-character descriptions): ~2 KB for the ArticleRecord and its
+    strings, ~1.5 KB of search postings and ~1 KB of deduplication, trending
+    and ordering state. A record is ~350 bytes smaller than the equivalent
+    dict. The defaults bound the 12 configured sources to 6,000 articles,
+    about 30 MB, well inside the 1 Gi pod limit.
+    """
+
+    def __init__(self, retention: Optional[float] = None, max_per_source: Optional[int] = None,
+                 keep_latest: int = 10):
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self.retention = retention if retention is not None else float(os.getenv("FEED_RETENTION_DAYS", "14")) * 86400
+        self.max_per_source = max_per_source or int(os.getenv("FEED_RETENTION_PER_SOURCE", "500"))
+        self.keep_latest = keep_latest
+
+        # Dedup key ("u:<url>" / "t:<fingerprint>") -> owners in ingestion order
+        self._owners: Dict[str, List[Tuple[str, str]]] = {}
+        # Full-text index over the same articles, kept in step on every put
+        self.search_index = SearchIndex()
+        self.version = 0
+        self.last_updated: Optional[datetime] = None
+
+    def __contains__(self, source_url: str) -> bool:
+        return source_url in self._sources
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def get(self, source_url: str) -> Optional[Dict[str, Any]]:
+        """Get the stored entry (articles and timestamp) for a source"""
+        return self._sources.get(source_url)
+
+    @staticmethod
+    def _dedup_keys(article: Dict[str, Any]) -> List[str]:
+        keys = []
+        if article.get("id"):
+            keys.append("u:" + article["id"])
+        if article.get("fingerprint"):
+            keys.append("t:" + article["fingerprint"])
+        return keys
+
+    def _unindex(self, source_url: str, articles: List[ArticleRecord]):
+        for article in articles:
+            owner = (source_url, article.id)
+            for key in self._dedup_keys(article):
+                owners = self._owners.get(key)
+                if owners and owner in owners:
+                    owners.remove(owner)
+                    if not owners:
+                        del self._owners[key]
+
+    def _index(self, source_url: str, articles: List[ArticleRecord]):
+        for article in articles:
+            owner = (source_url, article.id)
+            for key in self._dedup_keys(article):
+                owners = self._owners.setdefault(key, [])
+                if owner not in owners:
+                    owners.append(owner)
+
+    def is_duplicate(self, source_url: str, article: Dict[str, Any]) -> bool:
+        """
+        True if another article already owns this one's URL, or another
+        source owns its title fingerprint
+
+        A source reusing a headline ("Weekly Security Roundup") is publishing
+        a new post, not syndicating someone else's, so fingerprints only
+        dedupe across sources.
+        """
+        owner = (source_url, article.get("id", ""))
+        for key in self._dedup_keys(article):
+            owners = self._owners.get(key)
+            if not owners:
+                continue
+            if key.startswith("t:"):
+                if owners[0][0] != source_url:
+                    return True
+            elif owners[0] != owner:
+                return True
+        return False
+
+    def _retained(self, articles: List[ArticleRecord], now: float) -> List[ArticleRecord]:
+        """Apply the retention policy to a newest-first run"""
+        cutoff = now - self.retention
+        kept = articles[:self.keep_latest]
+        for article in articles[self.keep_latest:self.max_per_source]:
+            if article.published_ts < cutoff:
+                break
+            kept.append(article)
+        return kept
+
+    def _replace(self, source_url: str, articles: List[ArticleRecord], timestamp: datetime):
+        """Swap in a new newest-first run, updating the indexes for what changed"""
+        entry = self._sources.get(source_url)
+        old = {article.id: article for article in entry["articles"]} if entry else {}
+        new = {article.id: article for article in articles}
+        self._unindex(source_url, [article for article_id, article in old.items() if new.get(article_id) is not article])
+        self._index(source_url, [article for article_id, article in new.items() if old.get(article_id) is not article])
+        self.search_index.sync_source(source_url, articles)
+        self._sources[source_url] = {
+            "articles": articles,
+            "timestamp": timestamp
+        }
+        self.version += 1
+
+    def put(self, source_url: str, articles: List[Dict[str, Any]], timestamp: Optional[datetime] = None):
+        """
+        Merge freshly fetched articles into a source's retained history
+
+        Articles with the same id as a retained one replace it. Accepts parser
+        dicts or ArticleRecords.
+        """
+        now = timestamp or datetime.utcnow()
+
+        # Keep each source as a newest-first run sorted by (published_ts, id)
+        # so cursor positions can be found by bisection
+        merged = {}
+        entry = self._sources.get(source_url)
+        if entry:
+            merged.update((article.id, article) for article in entry["articles"])
+        for article in articles:
+            record = ArticleRecord.from_article(article)
+            merged[record.id] = record
+        run = sorted(merged.values(), key=order_key, reverse=True)
+
+        self._replace(source_url, self._retained(run, time.time()), now)
+        self.last_updated = max(now, self.last_updated) if self.last_updated else now
+
+    def touch(self, source_url: str):
+        """Mark a source as checked without changing its articles, expiring old history"""
+        entry = self._sources.get(source_url)
+        if entry is None:
+            return
+        entry["timestamp"] = datetime.utcnow()
+        retained = self._retained(entry["articles"], time.time())
+        if len(retained) < len(entry["articles"]):
+            self._replace(source_url, retained, entry["timestamp"])
+
+    @property
+    def article_count(self) -> int:
+        return sum(len(entry["articles"]) for entry in self._sources.values())
+
+    def items(self):
+        return list(self._sources.items())
+
+    def _bounds(self, entry: Dict[str, Any], before: Optional[OrderKey],
+                after: Optional[OrderKey]) -> Tuple[int, int]:
+        """Index range of a run holding articles strictly between `after` and `before`"""
+        articles = entry["articles"]
+        start = _first_at_or_below(articles, before, inclusive=False) if before is not None else 0
+        end = _first_at_or_below(articles, after, inclusive=True) if after is not None else len(articles)
+        return start, max(start, end)
+
+    def iter_merged(self, source_urls: List[str], before: Optional[OrderKey] = None,
+                    after: Optional[OrderKey] = None, oldest_first: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the given sources' articles in feed order, skipping duplicates
+
+        `before`/`after` are exclusive order-key bounds. Newest-first by default;
+        `oldest_first` walks upward from `after` instead.
+        """
+        runs = []
+        for source_url in set(source_urls):
+            entry = self._sources.get(source_url)
+            if entry and entry["articles"]:
+                start, end = self._bounds(entry, before, after)
+                if start < end:
+                    indices = range(end - 1, start - 1, -1) if oldest_first else range(start, end)
+                    runs.append(self._iter_source(source_url, entry["articles"], indices))
+        return heapq.merge(*runs, key=order_key, reverse=not oldest_first)
+
+    def _iter_source(self, source_url: str, articles: List[Dict[str, Any]], indices: range) -> Iterator[Dict[str, Any]]:
+        for i in indices:
+            article = articles[i]
+            if not self.is_duplicate(source_url, article):
+                yield article
+
+    def page(self, source_urls: List[str], limit: int, before: Optional[OrderKey] = None,
+             after: Optional[OrderKey] = None, nearest_after: bool = False) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Get one newest-first page between the exclusive bounds
+
+        Returns (articles, has_more). By default the page is the newest
+        `limit` articles in range and has_more means older ones remain; with
+        `nearest_after` it is the `limit` articles just above `after` and
+        has_more means newer ones remain.
+        """
+        if nearest_after:
+            articles = list(islice(self.iter_merged(source_urls, before, after, oldest_first=True), limit + 1))
+            has_more = len(articles) > limit
+            return list(reversed(articles[:limit])), has_more
+
+        articles = list(islice(self.iter_merged(source_urls, before, after), limit + 1))
+        return articles[:limit], len(articles) > limit
+
+    def search(self, query: str, limit: int, categories: Optional[List[str]] = None,
+               sources: Optional[List[str]] = None, since: Optional[float] = None,
+               until: Optional[float] = None) -> Tuple[List[Tuple[float, Dict[str, Any]]], int]:
+        """BM25-ranked (score, article) hits, leaving duplicates to the source that owns them"""
+        hits, total = self.search_index.search(
+            query, limit, categories=categories, sources=sources, since=since, until=until,
+            exclude=self.is_duplicate
+        )
+        return [(score, article) for score, article, _ in hits], total
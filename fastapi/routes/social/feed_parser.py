@@ -0,0 +1,167 @@
+import feedparser
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import calendar
+import hashlib
+import re
+import time
+from .html_text import html_to_text
+
+# Query parameters that only track the referrer and never identify content
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|source)$', re.IGNORECASE)
+_TITLE_WORDS = re.compile(r'[a-z0-9]+')
+
+
+# Closing tag of an RSS <item> or Atom <entry>, with an optional namespace prefix
+_ENTRY_END = re.compile(rb'</(?:[A-Za-z_][\w.-]*:)?(?:item|entry)\s*>', re.IGNORECASE)
+_FEED_ROOT = re.compile(rb'<(?:[A-Za-z_][\w.-]*:)?(rss|feed|RDF)[\s>]')
+_ROOT_CLOSE = {b"rss": b"</channel></rss>", b"feed": b"</feed>", b"RDF": b"</rdf:RDF>"}
+
+
+class FeedBodyReader:
+    """
+    Accumulates a streamed feed body until it holds enough entries
+
+    Chunks are scanned for entry closing tags as they arrive; once
+    `max_entries` entries are complete (or `max_bytes` have been read) the
+    caller stops downloading, and `body()` returns the document cut after
+    the last complete entry with the root element closed again, so
+    feedparser only sees the entries we keep.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.buffer = bytearray()
+        self.entries = 0
+        self.truncated = False
+        self._entries_end = 0  # Offset just past the last complete entry
+        self._scan_from = 0
+
+    @property
+    def done(self) -> bool:
+        return self.entries >= self.max_entries or len(self.buffer) >= self.max_bytes
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a chunk; returns True once no more of the body is needed"""
+        self.buffer += chunk[:self.max_bytes - len(self.buffer)]
+        if len(self.buffer) >= self.max_bytes:
+            self.truncated = True
+
+        for match in _ENTRY_END.finditer(self.buffer, self._scan_from):
+            self.entries += 1
+            self._entries_end = match.end()
+            if self.entries >= self.max_entries:
+                self.truncated = True
+                break
+        # A closing tag may straddle the next chunk boundary
+        self._scan_from = max(self._entries_end, len(self.buffer) - 32)
+        return self.done
+
+    def body(self) -> bytes:
+        if not self.truncated or not self._entries_end:
+            return bytes(self.buffer)
+        root = _FEED_ROOT.search(self.buffer, 0, 4096)
+        closing = _ROOT_CLOSE.get(root.group(1), b"") if root else b""
+        return bytes(self.buffer[:self._entries_end]) + closing
+
+
+def extract_domain(url: str) -> str:
+    """Extract domain from URL"""
+    match = re.search(r'https?://([^/]+)', url or "")
+    return match.group(1) if match else ""
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL: lowercase host, no tracking params, fragment or trailing slash"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(key)
+    ])
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", parts.netloc.lower(), path, query, ""))
+
+
+def title_fingerprint(title: str) -> str:
+    """Order- and punctuation-insensitive fingerprint of a headline"""
+    words = sorted(set(_TITLE_WORDS.findall((title or "").lower())))
+    return _digest(*words) if words else ""
+
+
+def entry_id(entry) -> str:
+    """Stable identity of a feed entry: its normalized link, falling back to the GUID"""
+    link = normalize_url(entry.get("link", ""))
+    if link:
+        return link
+    return entry.get("id", "") or _digest(entry.get("title", ""), entry.get("published", ""))
+
+
+def parse_feed(content: bytes, source: Dict[str, str], max_entries: int = 10,
+               known: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Parse an RSS/Atom body into article dicts
+
+    Pure and CPU-bound so it can run on the parse executor's thread or
+    process pool without touching the event loop.
+
+    `known` maps entry ids already in the store to their content digest.
+    Entries whose digest is unchanged are not cleaned again; they come back
+    as {"id", "digest", "unchanged": True} placeholders for the caller to
+    resolve against the articles it already holds.
+    """
+    feed = feedparser.parse(content)
+    known = known or {}
+
+    articles = []
+    for entry in feed.entries[:max_entries]:
+        article_id = entry_id(entry)
+        raw_description = entry.get("description") or entry.get("summary") or ""
+        digest = _digest(
+            entry.get("title", ""), entry.get("link", ""), entry.get("published", ""), raw_description
+        )
+        if known.get(article_id) == digest:
+            articles.append({"id": article_id, "digest": digest, "unchanged": True})
+            continue
+
+        # Extract and clean description
+        description = ""
+        if hasattr(entry, 'description'):
+            description = html_to_text(entry.description, 200) + "..."
+        elif hasattr(entry, 'summary'):
+            description = html_to_text(entry.summary, 200) + "..."
+
+        # Parse published date (epoch seconds, UTC)
+        published_ts = time.time()
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            try:
+                published_ts = float(calendar.timegm(entry.published_parsed))
+            except (TypeError, ValueError, OverflowError):
+                pass
+        published = datetime.utcfromtimestamp(int(published_ts))
+
+        link = entry.link if hasattr(entry, 'link') else ""
+        title = entry.get("title", "")
+        articles.append({
+            "id": article_id,
+            "digest": digest,
+            # Untitled entries have nothing in common to dedupe on
+            "fingerprint": title_fingerprint(title),
+            "title": title or "No Title",
+            "description": description,
+            "url": link,
+            "source": source["name"],
+            "category": source["category"],
+            "published": published.isoformat(),
+            "published_ts": published_ts,
+            "domain": extract_domain(link)
+        })
+
+    return articles
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+from .feed_service import FeedService
+from .feed_snapshot import FeedSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class FeedRefresher:
+    """Background scheduler that keeps FeedService's article store warm.
+
+    Each source runs in its own task so requests never wait on upstream
+    fetches and a slow or dead source never delays the others. The delay
+    between polls comes from the source's adaptive schedule: learned from
+    its update frequency, backed off after failures, and held off entirely
+    while its circuit breaker is open.
+    """
+
+    def __init__(self, feed_service: FeedService, snapshot: Optional[FeedSnapshot] = None):
+        self.feed_service = feed_service
+        self.snapshot = snapshot
+        self.snapshot_interval = float(os.getenv("FEED_SNAPSHOT_INTERVAL", "60"))
+        self.enabled = os.getenv("FEED_BACKGROUND_REFRESH", "true").lower() == "true"
+        self.sync_interval = float(os.getenv("FEED_SYNC_INTERVAL", "15"))
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        """Start one refresh loop per source (called from main.lifespan)"""
+        if not self.enabled or self.running:
+            return
+
+        sources: List[Dict[str, str]] = [
+            source
+            for sources in self.feed_service.feed_sources.values()
+            for source in sources
+        ]
+        for source in sources:
+            self._tasks[source["url"]] = asyncio.create_task(
+                self._run_source(source), name=f"feed-refresh:{source['name']}"
+            )
+        self._tasks["generation"] = asyncio.create_task(
+            self._watch_generation(), name="feed-generation-watch"
+        )
+        if self.snapshot is not None:
+            self._tasks["snapshot"] = asyncio.create_task(
+                self._save_snapshots(), name="feed-snapshot"
+            )
+        self.feed_service.background_refresh = True
+        logger.info(f"Feed refresher started for {len(sources)} sources")
+
+    async def stop(self):
+        """Cancel all refresh loops (called from main.lifespan)"""
+        self.feed_service.background_refresh = False
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        if self.snapshot is not None:
+            await self.snapshot.save()
+
+    async def _watch_generation(self):
+        """Adopt shared sources whenever another replica forces a refresh"""
+        generation = None
+        while True:
+            try:
+                current = await self.feed_service.get_generation()
+                if generation is not None and current != generation:
+                    adopted = await self.feed_service.sync_from_shared()
+                    logger.info(f"Feed generation {current}: adopted {adopted} sources")
+                generation = current
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Feed generation check failed: {e}")
+            await asyncio.sleep(self.sync_interval)
+
+    async def _save_snapshots(self):
+        """Persist the article store periodically so restarts come up warm"""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            await self.snapshot.save()
+
+    async def _run_source(self, source: Dict[str, str]):
+        schedule = self.feed_service.schedule(source)
+        while True:
+            try:
+                await self.feed_service.refresh_source(source)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background refresh failed for {source['name']}: {e}")
+                schedule.record_failure(e)
+            await asyncio.sleep(schedule.next_delay())
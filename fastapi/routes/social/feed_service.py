@@ -1,19 +1,90 @@
 import httpx
-import feedparser
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import asyncio
-import re
+import os
+import time
 import logging
+from core.http_client import http_client
+from core.executors import parse_executor
+from core.singleflight import SingleFlight
+from core.cache_backends import cache_backend
+from core.events import event_broker
+from core.metrics import metrics
+from .article_store import ArticleStore, encode_cursor, decode_cursor, parse_since, order_key
+from .feed_parser import parse_feed, FeedBodyReader
+from .trending import TrendingCounter
+from .source_health import SourceSchedule, CLOSED
 
 logger = logging.getLogger(__name__)
 
+FEED_FETCHES = metrics.counter(
+    "feed_fetches_total",
+    "Feed polls by source and outcome (HTTP status, \"error\" or \"parse_error\")",
+    ["source", "status"]
+)
+FEED_FETCH_SECONDS = metrics.histogram(
+    "feed_fetch_duration_seconds",
+    "Feed poll time from request to parsed articles",
+    ["source"]
+)
+FEED_FETCH_BYTES = metrics.counter(
+    "feed_fetch_bytes_total",
+    "Feed body bytes downloaded",
+    ["source"]
+)
+FEED_PARSE_SECONDS = metrics.histogram(
+    "feed_parse_duration_seconds",
+    "Feed parse time, including the wait for a parse worker",
+    ["source"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+FEED_POLL_INTERVAL = metrics.gauge(
+    "feed_poll_interval_seconds",
+    "Adaptive poll interval learned per source",
+    ["source"]
+)
+FEED_CIRCUIT_OPEN = metrics.gauge(
+    "feed_circuit_open",
+    "1 while a source's circuit breaker is open (or half-open), else 0",
+    ["source"]
+)
+FEED_ARTICLES_STORED = metrics.gauge(
+    "feed_articles_stored",
+    "Articles retained in the article store"
+)
+
 
 class FeedService:
     def __init__(self):
-        self._cache = {}
-        self._cache_duration = timedelta(minutes=15)  # Cache for 15 minutes
+        self.trending = TrendingCounter()  # Keyword counts updated as articles arrive
+        # Default poll interval for sources without their own refresh_interval
+        self._cache_duration = timedelta(seconds=float(os.getenv("FEED_REFRESH_INTERVAL", "900")))
+        
+        # Parsed articles per source URL, kept warm by FeedRefresher; history
+        # is retained across refreshes (see ArticleStore for the budget)
+        self.store = ArticleStore()
+        self._max_entries = int(os.getenv("FEED_MAX_ENTRIES", "50"))  # Entries parsed per fetch
+        self._max_bytes = int(os.getenv("FEED_MAX_BYTES", str(2 * 1024 * 1024)))  # Body bytes read per fetch
+        
+        # ETag/Last-Modified validators per source URL for conditional GETs
+        self._validators: Dict[str, Dict[str, Optional[str]]] = {}
+        
+        # Adaptive poll interval and circuit breaker per source URL
+        self._schedules: Dict[str, SourceSchedule] = {}
+        self._fetch_timeout = float(os.getenv("FEED_FETCH_TIMEOUT", "8"))
+        
+        # One in-flight fetch per source URL, shared by every caller
+        self._inflight = SingleFlight()
+        self._revalidations = set()
+        self.background_refresh = False
+        self._warm = asyncio.Event()
+        self._warm_timeout = 15.0
+        
+        # Cache shared between replicas: each source's parsed articles are
+        # published there so other pods can adopt them instead of refetching
+        self.backend = cache_backend
+        self._shared_seen: Dict[str, float] = {}
         
         # Security and tech news RSS feeds
         self.feed_sources = {
@@ -22,31 +93,36 @@ class FeedService:
                     "name": "Krebs on Security",
                     "url": "https://krebsonsecurity.com/feed/",
                     "category": "security",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 600
                 },
                 {
                     "name": "The Hacker News",
                     "url": "https://feeds.feedburner.com/TheHackersNews",
-                    "category": "security", 
-                    "type": "rss"
+                    "category": "security",
+                    "type": "rss",
+                    "refresh_interval": 600
                 },
                 {
                     "name": "Bleeping Computer",
                     "url": "https://www.bleepingcomputer.com/feed/",
                     "category": "security",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 600
                 },
                 {
                     "name": "SANS Internet Storm Center",
                     "url": "https://isc.sans.edu/rssfeed.xml",
                     "category": "security",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 600
                 },
                 {
                     "name": "Dark Reading",
                     "url": "https://www.darkreading.com/rss.xml",
                     "category": "security",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 600
                 }
             ],
             "tech": [
@@ -54,25 +130,29 @@ class FeedService:
                     "name": "Ars Technica",
                     "url": "https://feeds.arstechnica.com/arstechnica/index",
                     "category": "tech",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 900
                 },
                 {
                     "name": "TechCrunch",
                     "url": "https://techcrunch.com/feed/",
                     "category": "tech",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 900
                 },
                 {
                     "name": "Hacker News",
                     "url": "https://hnrss.org/frontpage",
                     "category": "tech",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 900
                 },
                 {
                     "name": "The Verge",
                     "url": "https://www.theverge.com/rss/index.xml",
                     "category": "tech",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 900
                 }
             ],
             "devops": [
@@ -80,152 +160,393 @@ class FeedService:
                     "name": "Kubernetes Blog",
                     "url": "https://kubernetes.io/feed.xml",
                     "category": "devops",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 1800
                 },
                 {
                     "name": "Docker Blog",
                     "url": "https://www.docker.com/blog/feed/",
                     "category": "devops",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 1800
                 },
                 {
                     "name": "DevOps.com",
                     "url": "https://devops.com/feed/",
                     "category": "devops",
-                    "type": "rss"
+                    "type": "rss",
+                    "refresh_interval": 1800
                 }
             ]
         }
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid"""
-        if cache_key not in self._cache:
-            return False
+    def _conditional_headers(self, source: Dict[str, str]) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers from stored validators"""
+        validators = self._validators.get(source["url"])
         
-        cached_time = self._cache[cache_key].get("timestamp")
-        if not cached_time:
-            return False
-            
-        return datetime.utcnow() - cached_time < self._cache_duration
+        # Without stored articles a 304 would leave us with nothing to serve
+        if not validators or source["url"] not in self.store:
+            return {}
+        
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
     
-    async def _fetch_rss_feed(self, source: Dict[str, str]) -> List[Dict[str, Any]]:
-        """Fetch and parse RSS feed"""
+    async def _fetch_rss_feed(self, source: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch and parse RSS feed
+        
+        Returns None when the upstream answers 304 Not Modified, in which case
+        the feed body is neither downloaded nor parsed, and also when every
+        entry is one we already hold unchanged. Only the first
+        FEED_MAX_ENTRIES entries (and at most FEED_MAX_BYTES) are read.
+        """
+        name = source["name"]
+        status = "error"
+        received = 0
+        started = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(source["url"])
+            # Stream the body and stop reading once it holds the entries we
+            # keep (or FEED_MAX_BYTES), so feeds shipping full article HTML
+            # are neither fully downloaded nor fully parsed
+            async with http_client.stream(
+                "GET", source["url"], headers=self._conditional_headers(source), timeout=self._fetch_timeout
+            ) as response:
+                status = str(response.status_code)
+                if response.status_code == 304:
+                    self.schedule(source).record_success(changed=False)
+                    return None
                 response.raise_for_status()
                 
-                # Parse RSS feed
-                feed = feedparser.parse(response.content)
-                
-                articles = []
-                for entry in feed.entries[:10]:  # Limit to 10 articles per source
-                    # Extract and clean description
-                    description = ""
-                    if hasattr(entry, 'description'):
-                        soup = BeautifulSoup(entry.description, 'html.parser')
-                        description = soup.get_text().strip()[:200] + "..."
-                    elif hasattr(entry, 'summary'):
-                        soup = BeautifulSoup(entry.summary, 'html.parser')
-                        description = soup.get_text().strip()[:200] + "..."
-                    
-                    # Parse published date
-                    published = datetime.utcnow()
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        try:
-                            published = datetime(*entry.published_parsed[:6])
-                        except (TypeError, ValueError):
-                            pass
-                    
-                    articles.append({
-                        "title": entry.title if hasattr(entry, 'title') else "No Title",
-                        "description": description,
-                        "url": entry.link if hasattr(entry, 'link') else "",
-                        "source": source["name"],
-                        "category": source["category"],
-                        "published": published.isoformat(),
-                        "domain": self._extract_domain(entry.link if hasattr(entry, 'link') else "")
-                    })
-                
-                return articles
+                reader = FeedBodyReader(self._max_entries, self._max_bytes)
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    if reader.feed(chunk):
+                        break
+            if reader.truncated:
+                logger.debug(f"Stopped reading {source['name']} after {len(reader.buffer)} bytes, {reader.entries} entries")
+            
+            # Parse off the event loop (thread or process pool), skipping
+            # the cleanup of entries we already hold unchanged
+            previous = {
+                article["id"]: article
+                for article in (self.store.get(source["url"]) or {}).get("articles", [])
+                if "id" in article
+            }
+            known = {article_id: article["digest"] for article_id, article in previous.items()}
+            parse_started = time.perf_counter()
+            parsed = await parse_executor.run(
+                parse_feed, reader.body(), source, max_entries=self._max_entries, known=known
+            )
+            FEED_PARSE_SECONDS.observe(time.perf_counter() - parse_started, source=name)
+            articles = [
+                previous[article["id"]] if article.get("unchanged") else article
+                for article in parsed
+            ]
+            
+            # Nothing new or changed: treat like a 304 (entries that dropped
+            # off the upstream feed stay in the retained history anyway)
+            if parsed and all(article.get("unchanged") for article in parsed):
+                articles = None
+            
+            # Remember validators for the next conditional request
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._validators[source["url"]] = {
+                    "etag": etag,
+                    "last_modified": last_modified
+                }
+            else:
+                self._validators.pop(source["url"], None)
+            
+            self.schedule(source).record_success(changed=articles is not None)
+            return articles
                 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching RSS from {source['name']}: {e}")
+            self.schedule(source).record_failure(e)
             return []
         except Exception as e:
+            status = "parse_error"
             logger.error(f"Error parsing RSS from {source['name']}: {e}")
+            self.schedule(source).record_failure(e)
             return []
+        finally:
+            FEED_FETCHES.inc(source=name, status=status)
+            FEED_FETCH_SECONDS.observe(time.perf_counter() - started, source=name)
+            if received:
+                FEED_FETCH_BYTES.inc(received, source=name)
+    
+    def _get_sources(self, categories: List[str]) -> List[Dict[str, str]]:
+        """Get the configured sources for the given categories"""
+        sources = []
+        for category in categories:
+            sources.extend(self.feed_sources.get(category, []))
+        return sources
+    
+    def _refresh_interval(self, source: Dict[str, str]) -> float:
+        return float(source.get("refresh_interval", self._cache_duration.total_seconds()))
+    
+    def schedule(self, source: Dict[str, str]) -> SourceSchedule:
+        """Adaptive polling state of a source"""
+        schedule = self._schedules.get(source["url"])
+        if schedule is None:
+            schedule = self._schedules[source["url"]] = SourceSchedule(self._refresh_interval(source))
+        return schedule
+    
+    def source_health(self) -> Dict[str, Dict[str, Any]]:
+        """Polling and circuit-breaker state per source name"""
+        return {
+            source["name"]: self.schedule(source).snapshot()
+            for sources in self.feed_sources.values()
+            for source in sources
+        }
+    
+    def _is_source_fresh(self, source: Dict[str, str]) -> bool:
+        """Check if the stored articles for a source are within its current poll interval"""
+        entry = self.store.get(source["url"])
+        if not entry:
+            return False
+        return datetime.utcnow() - entry["timestamp"] < timedelta(seconds=self.schedule(source).interval)
+    
+    async def refresh_source(self, source: Dict[str, str], force: bool = False) -> int:
+        """
+        Fetch a single source and store its parsed articles
+        
+        Concurrent refreshes of the same source share one upstream fetch, and
+        a copy another replica published within the source's refresh interval
+        is adopted instead of fetching (unless `force` is set).
+        Keeps the previously stored articles when the fetch fails or the
+        upstream reports the feed as not modified, and skips the fetch
+        entirely while the source's circuit breaker is open.
+        Returns the number of articles now stored for the source.
+        """
+        return await self._inflight.do(source["url"], lambda: self._refresh_source(source, force))
+    
+    async def _refresh_source(self, source: Dict[str, str], force: bool = False) -> int:
+        schedule = self.schedule(source)
+        if force or not await self._adopt_shared(source, max_age=schedule.interval):
+            if not schedule.allow():
+                logger.debug(f"Skipping {source['name']}: circuit open after {schedule.failures} failures")
+            else:
+                articles = await self._fetch_rss_feed(source)
+                
+                if articles is None:
+                    self.store.touch(source["url"])
+                    await self._publish_shared(source)
+                elif articles or source["url"] not in self.store:
+                    self._store_articles(source, articles)
+                    await self._publish_shared(source)
+        
+        entry = self.store.get(source["url"])
+        if entry:
+            schedule.learn([article.published_ts for article in entry["articles"][:20]])
+        FEED_POLL_INTERVAL.set(schedule.interval, source=source["name"])
+        FEED_CIRCUIT_OPEN.set(0 if schedule.state == CLOSED else 1, source=source["name"])
+        FEED_ARTICLES_STORED.set(self.store.article_count)
+        
+        # Every source has completed its first pass
+        if len(self.store) >= sum(len(sources) for sources in self.feed_sources.values()):
+            self._warm.set()
+        
+        return len(entry["articles"]) if entry else 0
+    
+    # Article fields exposed to clients (mirrors FeedArticle)
+    PUBLIC_FIELDS = ("title", "description", "url", "source", "category", "published", "domain")
+    
+    def _store_articles(self, source: Dict[str, str], articles: List[Dict[str, Any]]):
+        """Store a source's articles and push the ones not seen before to stream subscribers"""
+        previous = self.store.get(source["url"])
+        known = {article["id"] for article in previous["articles"]} if previous else set()
+        self.store.put(source["url"], articles)
+        self.trending.add_many(articles)
+        
+        fresh = [
+            article for article in articles
+            if article["id"] not in known and not self.store.is_duplicate(source["url"], article)
+        ]
+        if fresh:
+            event_broker.publish("feed", "articles", {
+                "category": source["category"],
+                "source": source["name"],
+                "articles": [
+                    {field: article.get(field) for field in self.PUBLIC_FIELDS} for article in fresh
+                ]
+            }, key=source["category"], event_id=encode_cursor(max(order_key(article) for article in fresh)))
+    
+    def _shared_key(self, source: Dict[str, str]) -> str:
+        return f"feed:source:{source['url']}"
+    
+    async def _publish_shared(self, source: Dict[str, str]):
+        """Publish a source's articles and validators to the shared cache"""
+        fetched_at = time.time()
+        self._shared_seen[source["url"]] = fetched_at
+        try:
+            await self.backend.set(self._shared_key(source), {
+                "articles": [article.to_dict() for article in self.store.get(source["url"])["articles"]],
+                "validators": self._validators.get(source["url"]),
+                "fetched_at": fetched_at
+            }, ttl=max(self._refresh_interval(source), self.schedule(source).interval) * 4)
+        except Exception as e:
+            logger.warning(f"Failed to publish {source['name']} to shared cache: {e}")
     
-    def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL"""
+    async def _adopt_shared(self, source: Dict[str, str], max_age: Optional[float] = None) -> bool:
+        """Adopt a newer copy of a source from the shared cache, if there is one"""
         try:
-            import re
-            match = re.search(r'https?://([^/]+)', url)
-            return match.group(1) if match else ""
-        except:
-            return ""
+            shared = await self.backend.get(self._shared_key(source))
+        except Exception as e:
+            logger.warning(f"Failed to read {source['name']} from shared cache: {e}")
+            return False
+        
+        if not shared or shared["fetched_at"] <= self._shared_seen.get(source["url"], 0):
+            return False
+        if max_age is not None and time.time() - shared["fetched_at"] >= max_age:
+            return False
+        
+        self._store_articles(source, shared["articles"])
+        if shared.get("validators"):
+            self._validators[source["url"]] = shared["validators"]
+        self._shared_seen[source["url"]] = shared["fetched_at"]
+        return True
+    
+    async def sync_from_shared(self) -> int:
+        """Adopt every source another replica has refreshed since we last looked"""
+        adopted = 0
+        for sources in self.feed_sources.values():
+            for source in sources:
+                if await self._adopt_shared(source):
+                    adopted += 1
+        return adopted
+    
+    async def get_generation(self) -> int:
+        """Cluster-wide feed generation, bumped by manual refreshes"""
+        return int(await self.backend.get("feed:generation") or 0)
     
-    async def get_feed_articles(self, categories: List[str] = None, limit: int = 50) -> Dict[str, Any]:
+    async def bump_generation(self) -> int:
+        """Tell every replica to pick up freshly published sources"""
+        return await self.backend.incr("feed:generation")
+    
+    def _revalidate(self, source: Dict[str, str]):
+        """Refresh a stale source in the background"""
+        if source["url"] in self._inflight:
+            return
+        task = asyncio.create_task(self.refresh_source(source))
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+    
+    async def refresh_all(self, categories: List[str] = None, force: bool = False) -> int:
+        """Refresh every source in the given categories concurrently"""
+        if categories is None:
+            categories = list(self.feed_sources.keys())
+        
+        results = await asyncio.gather(
+            *(self.refresh_source(source, force) for source in self._get_sources(categories)),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Task failed: {result}")
+        
+        return sum(result for result in results if isinstance(result, int))
+    
+    async def _ensure_sources(self, sources: List[Dict[str, str]]):
+        """Make sure the store can serve these sources before a read"""
+        if self.background_refresh:
+            # Only block during the very first warm-up after startup, and
+            # only while some requested source has nothing stored yet
+            if not self._warm.is_set() and any(source["url"] not in self.store for source in sources):
+                try:
+                    await asyncio.wait_for(self._warm.wait(), timeout=self._warm_timeout)
+                except asyncio.TimeoutError:
+                    pass
+        else:
+            # Block only on sources we have nothing for; stale ones are served
+            # as-is while a background revalidation refreshes them
+            missing = [source for source in sources if source["url"] not in self.store]
+            if missing:
+                await asyncio.gather(*(self.refresh_source(source) for source in missing))
+            for source in sources:
+                if source not in missing and not self._is_source_fresh(source):
+                    self._revalidate(source)
+    
+    async def feed_version(self, categories: List[str]) -> int:
+        """
+        Version of the stored articles the given categories are served from
+        
+        Runs the same warm-up/revalidation as a read, so responses can be
+        validated against it before they are built.
+        """
+        await self._ensure_sources(self._get_sources(categories))
+        return self.store.version
+    
+    async def trending_version(self, categories: List[str]) -> Tuple[int, int]:
+        """Versions a trending response depends on: the counter's (after sliding its windows) and the store's"""
+        await self._ensure_sources(self._get_sources(categories))
+        self.trending.advance()
+        return self.trending.version, self.store.version
+    
+    async def get_feed_articles(self, categories: List[str] = None, limit: int = 50,
+                                before: Optional[str] = None, after: Optional[str] = None,
+                                since: Optional[str] = None) -> Dict[str, Any]:
         """
         Get articles from RSS feeds
         
+        Serves from the in-memory article store. While the background refresher
+        is running nothing is fetched here; otherwise stale sources are served
+        immediately and revalidated in the background.
+        
         Args:
             categories: List of categories to fetch ('security', 'tech', 'devops')
             limit: Maximum number of articles to return
+            before: Cursor; only return articles older than it (next page)
+            after: Cursor; only return the articles just newer than it
+            since: Cursor, epoch seconds or ISO timestamp; only return newer articles
+        
+        Raises:
+            ValueError: on a malformed cursor or when both `after` and `since` are given
         """
         if categories is None:
             categories = ['security', 'tech', 'devops']
         
-        cache_key = f"feed_articles_{','.join(sorted(categories))}"
+        if after and since:
+            raise ValueError("Use either 'after' or 'since', not both")
+        before_key = decode_cursor(before) if before else None
+        after_key = decode_cursor(after) if after else (parse_since(since) if since else None)
         
-        # Return cached data if valid
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]["data"]
+        sources = self._get_sources(categories)
+        await self._ensure_sources(sources)
         
-        all_articles = []
+        # Merged newest-first page over the per-source store
+        limited_articles, has_more = self.store.page(
+            [source["url"] for source in sources], limit,
+            before=before_key, after=after_key, nearest_after=bool(after)
+        )
+        last_updated = self.store.last_updated or datetime.utcnow()
         
-        # Fetch from each category
-        for category in categories:
-            if category not in self.feed_sources:
-                continue
-                
-            # Fetch all sources in this category concurrently
-            tasks = []
-            for source in self.feed_sources[category]:
-                tasks.append(self._fetch_rss_feed(source))
-            
-            try:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                for result in results:
-                    if isinstance(result, list):
-                        all_articles.extend(result)
-                    elif isinstance(result, Exception):
-                        logger.error(f"Task failed: {result}")
-            except Exception as e:
-                logger.error(f"Error gathering feed results for {category}: {e}")
-        
-        # Sort articles by published date (newest first)
-        all_articles.sort(key=lambda x: x['published'], reverse=True)
-        
-        # Limit results
-        limited_articles = all_articles[:limit]
-        
-        # Prepare response
-        response_data = {
-            "articles": limited_articles,
+        # prev_cursor marks the newest article the client has seen (pass it as
+        # `since`/`after` on the next poll); next_cursor continues to older ones
+        if limited_articles:
+            prev_cursor = encode_cursor(order_key(limited_articles[0]))
+        else:
+            prev_cursor = encode_cursor(after_key) if after_key else None
+        next_cursor = None
+        if limited_articles and (has_more and not after):
+            next_cursor = encode_cursor(order_key(limited_articles[-1]))
+        
+        return {
+            "articles": [article.to_dict() for article in limited_articles],
             "total_count": len(limited_articles),
             "categories": categories,
-            "last_updated": datetime.utcnow().isoformat(),
-            "sources": self._get_source_summary(categories)
-        }
-        
-        # Cache the result
-        self._cache[cache_key] = {
-            "data": response_data,
-            "timestamp": datetime.utcnow()
+            "last_updated": last_updated.isoformat(),
+            "sources": self._get_source_summary(categories),
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "has_more": has_more
         }
-        
-        return response_data
     
     def _get_source_summary(self, categories: List[str]) -> List[Dict[str, str]]:
         """Get summary of sources being used"""
@@ -240,47 +561,63 @@ class FeedService:
                     })
         return sources
     
-    async def get_trending_topics(self, categories: List[str] = None) -> Dict[str, Any]:
+    async def search_articles(self, query: str, categories: List[str] = None,
+                              sources: Optional[List[str]] = None, since: Optional[str] = None,
+                              until: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
         """
-        Analyze articles and extract trending topics/keywords
+        Full-text search over the stored articles
+        
+        Args:
+            query: Search terms; results match any of them, ranked by BM25
+            categories: Only search these categories
+            sources: Only search these source names (e.g. "Krebs on Security")
+            since: Only articles published after this (epoch seconds, ISO timestamp or cursor)
+            until: Only articles published at or before this
+            limit: Maximum number of results
+        
+        Raises:
+            ValueError: on a malformed `since`/`until`
         """
-        cache_key = f"trending_topics_{','.join(sorted(categories or []))}"
+        if categories is None:
+            categories = ['security', 'tech', 'devops']
         
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]["data"]
+        await self._ensure_sources(self._get_sources(categories))
+        hits, total = self.store.search(
+            query, limit, categories=categories, sources=sources,
+            since=parse_since(since)[0] if since else None,
+            until=parse_since(until)[0] if until else None
+        )
         
-        # Get recent articles
-        feed_data = await self.get_feed_articles(categories, limit=100)
-        articles = feed_data["articles"]
+        return {
+            "query": query,
+            "results": [dict(article, score=round(score, 4)) for score, article in hits],
+            "total_matches": total,
+            "categories": categories,
+            "last_updated": (self.store.last_updated or datetime.utcnow()).isoformat()
+        }
+    
+    async def get_trending_topics(self, categories: List[str] = None, window: str = "24h",
+                                  limit: int = 10) -> Dict[str, Any]:
+        """
+        Top keywords of the articles published within a sliding window
         
-        # Simple keyword extraction from titles
-        word_counts = {}
-        tech_keywords = set(['security', 'vulnerability', 'malware', 'breach', 'hack', 'attack', 
-                           'kubernetes', 'docker', 'cloud', 'ai', 'ml', 'devops', 'api', 
-                           'zero-day', 'ransomware', 'phishing', 'exploit'])
+        Answered from the incrementally maintained trending counter; the
+        article list is never rescanned.
         
-        for article in articles:
-            title_words = re.findall(r'\b[a-zA-Z]{4,}\b', article['title'].lower())
-            for word in title_words:
-                if word in tech_keywords:
-                    word_counts[word] = word_counts.get(word, 0) + 1
+        Raises:
+            ValueError: on a window that is not configured
+        """
+        if categories is None:
+            categories = ['security', 'tech', 'devops']
         
-        # Get top trending topics
-        trending = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        await self._ensure_sources(self._get_sources(categories))
+        trending = self.trending.top(window, categories, limit)
         
-        response_data = {
+        return {
             "trending_topics": [{"keyword": word, "count": count} for word, count in trending],
-            "analysis_period": "last_100_articles",
-            "last_updated": datetime.utcnow().isoformat()
+            "analysis_period": f"last_{window}",
+            "last_updated": (self.store.last_updated or datetime.utcnow()).isoformat()
         }
-        
-        # Cache the result
-        self._cache[cache_key] = {
-            "data": response_data,
-            "timestamp": datetime.utcnow()
-        }
-        
-        return response_data
     
     def get_available_categories(self) -> Dict[str, Any]:
         """Get list of available feed categories"""
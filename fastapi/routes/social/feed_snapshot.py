@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+
+def _encode_record(value):
+    """json.dumps fallback for the store's ArticleRecords"""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _write_snapshot(path: str, snapshot: Dict[str, Any]):
+    """Write the snapshot atomically so a crash never leaves a torn file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+            f.write(json.dumps(snapshot, separators=(",", ":"), default=_encode_record).encode("utf-8"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _read_snapshot(path: str) -> Dict[str, Any]:
+    with gzip.open(path, "rb") as f:
+        return json.loads(f.read())
+
+
+class FeedSnapshot:
+    """
+    On-disk snapshot of FeedService's article store
+
+    A gzip-compressed JSON document holding each source's parsed articles,
+    fetch time and HTTP validators. Loaded in main.lifespan so a restarted pod
+    serves real articles immediately, and the first background refresh is a
+    cheap conditional GET instead of a full download.
+    """
+
+    def __init__(self, feed_service, path: str = None):
+        self.feed_service = feed_service
+        self.path = path or os.getenv("FEED_SNAPSHOT_PATH", "cache/feed_snapshot.json.gz")
+        self.enabled = os.getenv("FEED_SNAPSHOT_ENABLED", "true").lower() == "true"
+        self._saved_version = None
+
+    def _build(self) -> Dict[str, Any]:
+        # Built on the event loop; article lists are replaced, never mutated,
+        # and records are immutable, so the worker thread can serialize them
+        # safely (converting records to dicts as it goes)
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "saved_at": datetime.utcnow().isoformat(),
+            "sources": {
+                source_url: {
+                    "articles": entry["articles"],
+                    "timestamp": entry["timestamp"].isoformat(),
+                    "validators": self.feed_service._validators.get(source_url)
+                }
+                for source_url, entry in self.feed_service.store.items()
+            }
+        }
+
+    async def save(self, force: bool = False) -> bool:
+        """Persist the store if it changed since the last save"""
+        if not self.enabled:
+            return False
+        version = self.feed_service.store.version
+        if not force and version == self._saved_version:
+            return False
+        try:
+            await asyncio.to_thread(_write_snapshot, self.path, self._build())
+            self._saved_version = version
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save feed snapshot to {self.path}: {e}")
+            return False
+
+    async def load(self) -> int:
+        """Load a previous snapshot into the store; returns the number of sources restored"""
+        if not self.enabled or not os.path.exists(self.path):
+            return 0
+        try:
+            snapshot = await asyncio.to_thread(_read_snapshot, self.path)
+        except Exception as e:
+            logger.error(f"Ignoring unreadable feed snapshot {self.path}: {e}")
+            return 0
+        if snapshot.get("format") != SNAPSHOT_FORMAT:
+            return 0
+
+        # Only restore sources that are still configured
+        configured = {
+            source["url"]
+            for sources in self.feed_service.feed_sources.values()
+            for source in sources
+        }
+        restored = 0
+        for source_url, entry in snapshot.get("sources", {}).items():
+            if source_url not in configured or source_url in self.feed_service.store:
+                continue
+            self.feed_service.store.put(
+                source_url,
+                entry["articles"],
+                timestamp=datetime.fromisoformat(entry["timestamp"])
+            )
+            self.feed_service.trending.add_many(entry["articles"])
+            if entry.get("validators"):
+                self.feed_service._validators[source_url] = entry["validators"]
+            restored += 1
+
+        self._saved_version = self.feed_service.store.version
+        logger.info(f"Restored {restored} feed sources from {self.path}")
+        return restored
@@ -0,0 +1,160 @@
+from html.parser import HTMLParser
+from typing import List, Optional
+import os
+import threading
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml is optional
+    etree = None
+
+
+# Tags whose text never shows up in a summary (BeautifulSoup's get_text skips them too)
+_SKIP_TAGS = {"script", "style", "template"}
+
+# Feed chunk size: small enough that parsing stops soon after the limit is reached
+_CHUNK_SIZE = 1024
+
+
+class _TextCollector:
+    """Accumulates visible text until enough has been collected"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts: List[str] = []
+        self.length = 0
+        self.skip_depth = 0
+        self.done = False
+
+    def start(self, tag, attrib=None):
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+
+    def end(self, tag):
+        if tag in _SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def data(self, text: str):
+        if self.done or self.skip_depth or not text:
+            return
+        if not self.parts:
+            text = text.lstrip()
+            if not text:
+                return
+        self.parts.append(text)
+        self.length += len(text)
+        # Stop once there is visible text beyond the limit, so the result
+        # matches full_text.strip()[:limit] without reading the rest
+        if self.length > self.limit and "".join(self.parts)[self.limit:].strip():
+            self.done = True
+
+    def close(self):
+        return self.text()
+
+    def text(self) -> str:
+        text = "".join(self.parts)
+        if self.done:
+            return text[:self.limit]
+        return text.strip()[:self.limit]
+
+
+class _StdlibParser(HTMLParser):
+    def __init__(self, collector: _TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def unknown_decl(self, data):
+        if data.startswith("CDATA["):
+            self.collector.data(data[6:])
+
+
+def _extract_stdlib(html: str, limit: int) -> str:
+    collector = _TextCollector(limit)
+    parser = _StdlibParser(collector)
+    for offset in range(0, len(html), _CHUNK_SIZE):
+        parser.feed(html[offset:offset + _CHUNK_SIZE])
+        if collector.done:
+            return collector.text()
+    parser.close()
+    return collector.text()
+
+
+class _LxmlTarget(_TextCollector):
+    """Reusable lxml parser target; one per parse thread"""
+
+    def __init__(self):
+        super().__init__(0)
+        self.parser = etree.HTMLParser(target=self)
+
+    def reset(self, limit: int):
+        super().__init__(limit)
+
+
+_lxml_local = threading.local()
+
+
+def _extract_lxml(html: str, limit: int) -> str:
+    target = getattr(_lxml_local, "target", None)
+    if target is None:
+        target = _lxml_local.target = _LxmlTarget()
+    target.reset(limit)
+
+    try:
+        for offset in range(0, len(html), _CHUNK_SIZE):
+            target.parser.feed(html[offset:offset + _CHUNK_SIZE])
+            if target.done:
+                break
+        # Always close so the parser can be reused for the next fragment
+        target.parser.close()
+    except etree.LxmlError:
+        return _extract_stdlib(html, limit)
+    return target.text()
+
+
+def _select_backend(name: Optional[str]) -> str:
+    name = (name or "auto").lower()
+    if name == "auto":
+        return "lxml" if etree is not None else "html.parser"
+    if name == "lxml" and etree is None:
+        return "html.parser"
+    return name
+
+
+BACKEND = _select_backend(os.getenv("DESCRIPTION_PARSER"))
+
+
+def html_to_text(html: str, limit: int = 200, backend: Optional[str] = None) -> str:
+    """
+    Extract up to `limit` characters of visible text from an HTML fragment
+
+    Approximately BeautifulSoup(html).get_text().strip()[:limit], but streams
+    the markup and stops as soon as enough text has been collected instead of
+    building a full tree. Uses lxml when available, html.parser otherwise.
+
+    Known differences from BeautifulSoup's output:
+    - whitespace-only runs between tags are kept as they are, where
+      BeautifulSoup shortens them ("<p>x</p>   <p>y</p>" gives "x   y",
+      not "x y")
+    - with lxml, entities missing their semicolon ("&amp x") stay literal
+      instead of being decoded
+    """
+    if not html:
+        return ""
+
+    # Plain-text descriptions need no parsing at all
+    if "<" not in html and "&" not in html:
+        return html.strip()[:limit]
+
+    selected = _select_backend(backend) if backend else BACKEND
+    if selected == "lxml":
+        return _extract_lxml(html, limit)
+    return _extract_stdlib(html, limit)
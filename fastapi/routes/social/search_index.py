@@ -0,0 +1,161 @@
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .trending import tokenize
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was "
+    "were will with".split()
+)
+
+# Title terms count this many times over description terms
+TITLE_BOOST = 2
+
+
+def analyze(text: str) -> List[str]:
+    """Search terms of a piece of text"""
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+
+class SearchIndex:
+    """
+    In-memory inverted index with BM25 ranking
+
+    Documents are articles keyed by (source URL, article id). The index is
+    kept in step with the article store by diffing each source's new article
+    list against what is already indexed, so a refresh only tokenizes the
+    articles it actually adds. Category, source and date filters are applied
+    to the posting lists before scoring.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._next_id = 0
+        self._doc_ids: Dict[Tuple[str, str], int] = {}
+        self._source_keys: Dict[str, Set[Tuple[str, str]]] = {}
+        # doc id -> (article, source url, document length)
+        self._docs: Dict[int, Tuple[Dict[str, Any], str, int]] = {}
+        # term -> doc id -> term frequency
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._by_category: Dict[str, Set[int]] = {}
+        self._by_source: Dict[str, Set[int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _terms(self, article: Dict[str, Any]) -> Dict[str, int]:
+        frequencies: Dict[str, int] = {}
+        for term in analyze(article.get("title", "")):
+            frequencies[term] = frequencies.get(term, 0) + TITLE_BOOST
+        for term in analyze(article.get("description", "")):
+            frequencies[term] = frequencies.get(term, 0) + 1
+        return frequencies
+
+    def _add(self, source_url: str, article: Dict[str, Any]):
+        doc_id = self._next_id
+        self._next_id += 1
+        frequencies = self._terms(article)
+        length = sum(frequencies.values())
+
+        key = (source_url, article.get("id", ""))
+        self._doc_ids[key] = doc_id
+        self._source_keys.setdefault(source_url, set()).add(key)
+        self._docs[doc_id] = (article, source_url, length)
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        self._by_category.setdefault(article.get("category", ""), set()).add(doc_id)
+        self._by_source.setdefault(article.get("source", "").lower(), set()).add(doc_id)
+        self._total_length += length
+
+    def _remove(self, key: Tuple[str, str]):
+        doc_id = self._doc_ids.pop(key)
+        self._source_keys[key[0]].discard(key)
+        article, _, length = self._docs.pop(doc_id)
+        for term in self._terms(article):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._by_category.get(article.get("category", ""), set()).discard(doc_id)
+        self._by_source.get(article.get("source", "").lower(), set()).discard(doc_id)
+        self._total_length -= length
+
+    def sync_source(self, source_url: str, articles: List[Dict[str, Any]]):
+        """Make the source's indexed documents match `articles`"""
+        current = {(source_url, article.get("id", "")): article for article in articles}
+        for key in self._source_keys.get(source_url, set()) - current.keys():
+            self._remove(key)
+        for key, article in current.items():
+            doc_id = self._doc_ids.get(key)
+            if doc_id is not None:
+                indexed, _, length = self._docs[doc_id]
+                if indexed.get("digest") == article.get("digest"):
+                    # Unchanged: keep the posting lists, point at the new dict
+                    self._docs[doc_id] = (article, source_url, length)
+                    continue
+                self._remove(key)
+            self._add(source_url, article)
+
+    def _allowed(self, categories: Optional[Iterable[str]],
+                 sources: Optional[Iterable[str]]) -> Optional[Set[int]]:
+        allowed = None
+        if categories is not None:
+            allowed = set().union(*(self._by_category.get(category, set()) for category in categories))
+        if sources is not None:
+            by_source = set().union(*(self._by_source.get(source.lower(), set()) for source in sources))
+            allowed = by_source if allowed is None else allowed & by_source
+        return allowed
+
+    def search(self, query: str, limit: int = 20, categories: Optional[Iterable[str]] = None,
+               sources: Optional[Iterable[str]] = None, since: Optional[float] = None,
+               until: Optional[float] = None, exclude=None) -> Tuple[List[Tuple[float, Dict[str, Any], str]], int]:
+        """
+        Rank documents matching any query term with BM25
+
+        Returns the top `limit` (score, article, source url) hits and the
+        total number of matching documents. `exclude(source_url, article)`
+        can veto hits (used to drop cross-source duplicates).
+        """
+        terms = list(dict.fromkeys(analyze(query)))
+        if not terms or not self._docs:
+            return [], 0
+
+        allowed = self._allowed(categories, sources)
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count or 1.0
+
+        scores: Dict[int, float] = {}
+        rejected: Set[int] = set()
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                if doc_id in rejected:
+                    continue
+                if doc_id not in scores:
+                    article, source_url, _ = self._docs[doc_id]
+                    published = article.get("published_ts", 0)
+                    if ((allowed is not None and doc_id not in allowed)
+                            or (since is not None and published <= since)
+                            or (until is not None and published > until)
+                            or (exclude is not None and exclude(source_url, article))):
+                        rejected.add(doc_id)
+                        continue
+                length = self._docs[doc_id][2]
+                norm = self.K1 * (1 - self.B + self.B * length / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.K1 + 1) / (frequency + norm)
+
+        # Equal scores go to the newer article
+        top = heapq.nlargest(
+            limit, scores.items(),
+            key=lambda item: (item[1], self._docs[item[0]][0].get("published_ts", 0))
+        )
+        hits = [(score, self._docs[doc_id][0], self._docs[doc_id][1]) for doc_id, score in top]
+        return hits, len(scores)
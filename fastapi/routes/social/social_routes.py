@@ -1,12 +1,23 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+import os
+from core.conditional import version_etag, cache_control
+from core.responses import cached_json
 from .feed_service import FeedService
+from .feed_scheduler import FeedRefresher
+from .feed_snapshot import FeedSnapshot
 
 
 router = APIRouter()
 feed_service = FeedService()
+feed_snapshot = FeedSnapshot(feed_service)
+feed_refresher = FeedRefresher(feed_service, feed_snapshot)
+
+# Reads carry an ETag per article-store version; clients and nginx may reuse
+# a response this long before revalidating it with If-None-Match
+FEED_CACHE_CONTROL = cache_control(int(os.getenv("CACHE_CONTROL_MAX_AGE_FEED", "30")))
 
 
 class FeedArticle(BaseModel):
@@ -25,6 +36,21 @@ class FeedResponse(BaseModel):
     categories: List[str]
     last_updated: str
     sources: List[Dict[str, str]]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class SearchResult(FeedArticle):
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+    total_matches: int
+    categories: List[str]
+    last_updated: str
 
 
 class TrendingTopic(BaseModel):
@@ -46,6 +72,7 @@ class CategoriesResponse(BaseModel):
 
 @router.get("/feed", response_model=FeedResponse)
 async def get_social_feed(
+    request: Request,
     categories: Optional[str] = Query(
         default="security,tech",
         description="Comma-separated list of categories (security, tech, devops)"
@@ -55,6 +82,18 @@ async def get_social_feed(
         ge=1,
         le=100,
         description="Maximum number of articles to return (1-100)"
+    ),
+    before: Optional[str] = Query(
+        default=None,
+        description="Cursor: return articles older than this (use next_cursor)"
+    ),
+    after: Optional[str] = Query(
+        default=None,
+        description="Cursor: return the articles just newer than this"
+    ),
+    since: Optional[str] = Query(
+        default=None,
+        description="Cursor, epoch seconds or ISO timestamp: only return newer articles (use prev_cursor)"
     )
 ):
     """
@@ -62,8 +101,12 @@ async def get_social_feed(
     
     - **categories**: Comma-separated categories (security, tech, devops)
     - **limit**: Maximum number of articles (default: 30, max: 100)
+    - **before**: Opaque cursor for the next (older) page
+    - **after**: Opaque cursor; page of articles just newer than it
+    - **since**: Only articles newer than a cursor or timestamp, for cheap delta polling
     
     Returns latest articles from RSS feeds with links and descriptions.
+    Answers If-None-Match with 304 while the stored articles are unchanged.
     """
     try:
         # Parse categories
@@ -76,11 +119,20 @@ async def get_social_feed(
         if not category_list:
             category_list = ["security", "tech"]  # Default fallback
         
-        # Fetch feed data
-        feed_data = await feed_service.get_feed_articles(category_list, limit)
+        version = await feed_service.feed_version(category_list)
+        etag = version_etag(version, "feed", category_list, limit, before, after, since)
         
-        return FeedResponse(**feed_data)
+        async def build():
+            feed_data = await feed_service.get_feed_articles(
+                category_list, limit, before=before, after=after, since=since
+            )
+            return FeedResponse(**feed_data)
         
+        # Validated and encoded once per store version, then served as bytes
+        return await cached_json(request, etag, FEED_CACHE_CONTROL, build)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -88,19 +140,107 @@ async def get_social_feed(
         )
 
 
+@router.get("/feed/search", response_model=SearchResponse)
+async def search_social_feed(
+    request: Request,
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Search terms"
+    ),
+    categories: Optional[str] = Query(
+        default="security,tech,devops",
+        description="Comma-separated list of categories to search"
+    ),
+    sources: Optional[str] = Query(
+        default=None,
+        description="Comma-separated source names to search (default: all)"
+    ),
+    since: Optional[str] = Query(
+        default=None,
+        description="Only articles published after this (epoch seconds, ISO timestamp or cursor)"
+    ),
+    until: Optional[str] = Query(
+        default=None,
+        description="Only articles published at or before this (epoch seconds, ISO timestamp or cursor)"
+    ),
+    limit: int = Query(
+        default=20,
+        ge=1,
+        le=100,
+        description="Maximum number of results (1-100)"
+    )
+):
+    """
+    Full-text search over ingested articles
+    
+    - **q**: Search terms, matched against titles and descriptions
+    - **categories**: Categories to search (security, tech, devops)
+    - **sources**: Source names to search, e.g. "Krebs on Security"
+    - **since** / **until**: Publish date range
+    - **limit**: Maximum number of results (default: 20, max: 100)
+    
+    Results are ranked by BM25 relevance; title matches weigh more.
+    """
+    try:
+        category_list = [cat.strip() for cat in categories.split(",") if cat.strip()]
+        
+        valid_categories = {"security", "tech", "devops"}
+        category_list = [cat for cat in category_list if cat in valid_categories]
+        
+        if not category_list:
+            category_list = ["security", "tech", "devops"]
+        
+        source_list = [name.strip() for name in sources.split(",") if name.strip()] if sources else None
+        
+        version = await feed_service.feed_version(category_list)
+        etag = version_etag(version, "search", q, category_list, source_list, since, until, limit)
+        
+        async def build():
+            search_data = await feed_service.search_articles(
+                q, category_list, sources=source_list, since=since, until=until, limit=limit
+            )
+            return SearchResponse(**search_data)
+        
+        return await cached_json(request, etag, FEED_CACHE_CONTROL, build)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search social feed: {str(e)}"
+        )
+
+
 @router.get("/feed/trending", response_model=TrendingResponse)
 async def get_trending_topics(
+    request: Request,
     categories: Optional[str] = Query(
         default="security,tech",
         description="Comma-separated list of categories to analyze"
+    ),
+    window: str = Query(
+        default="24h",
+        description="Sliding time window to count over (1h, 24h, 7d)"
+    ),
+    limit: int = Query(
+        default=10,
+        ge=1,
+        le=50,
+        description="Number of topics to return (1-50)"
     )
 ):
     """
     Get trending topics from recent articles
     
     - **categories**: Categories to analyze for trends
+    - **window**: Only count articles published within this window
+    - **limit**: Number of topics to return
     
-    Analyzes recent articles and extracts trending keywords and topics.
+    Counts tracked keywords and phrases (TRENDING_VOCABULARY) in the titles of
+    articles published within the window.
     """
     try:
         # Parse categories
@@ -113,11 +253,18 @@ async def get_trending_topics(
         if not category_list:
             category_list = ["security", "tech"]
         
-        # Get trending analysis
-        trending_data = await feed_service.get_trending_topics(category_list)
+        version = await feed_service.trending_version(category_list)
+        etag = version_etag(version, "trending", category_list, window, limit)
+        
+        async def build():
+            # Get trending analysis
+            trending_data = await feed_service.get_trending_topics(category_list, window, limit)
+            return TrendingResponse(**trending_data)
         
-        return TrendingResponse(**trending_data)
+        return await cached_json(request, etag, FEED_CACHE_CONTROL, build)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -148,7 +295,8 @@ async def get_feed_sources():
     """
     Get detailed information about all RSS feed sources
     
-    Returns the complete list of RSS sources being monitored.
+    Returns the complete list of RSS sources being monitored, with each
+    source's adaptive poll interval and circuit-breaker state.
     """
     try:
         return {
@@ -157,6 +305,7 @@ async def get_feed_sources():
             "total_sources": sum(
                 len(sources) for sources in feed_service.feed_sources.values()
             ),
+            "health": feed_service.source_health(),
             "last_updated": datetime.utcnow().isoformat()
         }
         
@@ -172,19 +321,18 @@ async def refresh_feed_cache():
     """
     Manually refresh the feed cache
     
-    Forces a refresh of all cached feed data. Useful for testing or immediate updates.
+    Forces a refresh of all cached feed data on every replica. Useful for testing or immediate updates.
     """
     try:
-        # Clear cache
-        feed_service._cache.clear()
-        
-        # Fetch fresh data
-        fresh_data = await feed_service.get_feed_articles(["security", "tech", "devops"], 50)
+        # Fetch fresh data for every source, then have the other replicas
+        # adopt it from the shared cache
+        articles_fetched = await feed_service.refresh_all(force=True)
+        await feed_service.bump_generation()
         
         return {
             "message": "Feed cache refreshed successfully",
-            "articles_fetched": fresh_data["total_count"],
-            "categories": fresh_data["categories"],
+            "articles_fetched": articles_fetched,
+            "categories": list(feed_service.feed_sources.keys()),
             "refresh_time": datetime.utcnow().isoformat()
         }
         
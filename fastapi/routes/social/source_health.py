@@ -0,0 +1,109 @@
+import os
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SourceSchedule:
+    """
+    Adaptive polling state and circuit breaker for one feed source
+
+    The poll interval is learned from the source itself: half the median gap
+    between its recent entries' publish times, stretched by up to 2x as the
+    share of polls that found nothing new (304s and unchanged bodies) grows,
+    and clamped to [min_interval, max_interval]. Until there is enough
+    history the source's configured interval is used.
+
+    Failures back off exponentially; after `failure_threshold` consecutive
+    failures the circuit opens and the source is not fetched at all until
+    the backoff expires, when a single probe decides whether it closes again.
+    """
+
+    def __init__(self, base_interval: float, min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None, failure_threshold: Optional[int] = None,
+                 retry_interval: float = 60.0, max_backoff: Optional[float] = None):
+        self.base_interval = base_interval
+        self.min_interval = min_interval or float(os.getenv("FEED_MIN_INTERVAL", "120"))
+        self.max_interval = max_interval or float(os.getenv("FEED_MAX_INTERVAL", "21600"))
+        self.failure_threshold = failure_threshold or int(os.getenv("FEED_FAILURE_THRESHOLD", "3"))
+        self.max_backoff = max_backoff or float(os.getenv("FEED_MAX_BACKOFF", "3600"))
+        self.retry_interval = retry_interval
+
+        self.interval = base_interval
+        self.update_gap: Optional[float] = None
+        self.not_modified_rate = 0.0  # EWMA of polls that found nothing new
+        self.failures = 0
+        self.state = CLOSED
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[float] = None
+        self.polls = 0
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """Whether the source may be fetched now; moves an expired open circuit to half-open"""
+        if self.state == OPEN:
+            if (now or time.time()) < self.open_until:
+                return False
+            self.state = HALF_OPEN
+        return True
+
+    def record_success(self, changed: bool, now: Optional[float] = None):
+        self.polls += 1
+        self.failures = 0
+        self.state = CLOSED
+        self.last_error = None
+        self.last_success = now or time.time()
+        self.not_modified_rate = 0.7 * self.not_modified_rate + 0.3 * (0.0 if changed else 1.0)
+        self._update_interval()
+
+    def record_failure(self, error: Exception, now: Optional[float] = None):
+        self.polls += 1
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.open_until = (now or time.time()) + self.backoff()
+
+    def learn(self, published: List[float]):
+        """Estimate the update frequency from recent entry timestamps (newest first)"""
+        gaps = [newer - older for newer, older in zip(published, published[1:]) if newer > older]
+        if len(gaps) >= 3:
+            self.update_gap = statistics.median(gaps)
+            self._update_interval()
+
+    def _update_interval(self):
+        target = self.update_gap / 2 if self.update_gap else self.base_interval
+        target *= 1 + self.not_modified_rate
+        self.interval = min(self.max_interval, max(self.min_interval, target))
+
+    def backoff(self) -> float:
+        """Jittered exponential retry delay for the current failure streak"""
+        delay = min(self.max_backoff, self.retry_interval * 2 ** max(0, self.failures - 1))
+        return delay * random.uniform(0.8, 1.2)  # nosec B311 - jitter, not crypto
+
+    def next_delay(self, now: Optional[float] = None) -> float:
+        """Seconds until the source should be polled again"""
+        now = now or time.time()
+        if self.state == OPEN:
+            return max(0.0, self.open_until - now)
+        if self.failures:
+            return self.backoff()
+        return self.interval
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "interval": round(self.interval, 1),
+            "update_gap": round(self.update_gap, 1) if self.update_gap else None,
+            "not_modified_rate": round(self.not_modified_rate, 3),
+            "failures": self.failures,
+            "open_until": self.open_until if self.state == OPEN else None,
+            "last_error": self.last_error,
+            "last_success": self.last_success,
+            "polls": self.polls
+        }
@@ -0,0 +1,206 @@
+import bisect
+import heapq
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_VOCABULARY = (
+    "security, vulnerability, malware, breach, hack, attack, kubernetes, docker, "
+    "cloud, ai, ml, devops, api, zero-day, ransomware, phishing, exploit, "
+    "supply chain, open source, large language model"
+)
+
+WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric tokens; hyphens and punctuation split words"""
+    return _TOKEN.findall(text.lower())
+
+
+def parse_window(window: str) -> int:
+    """'90m', '1h', '7d' -> seconds"""
+    window = window.strip().lower()
+    if len(window) < 2 or window[-1] not in WINDOW_UNITS or not window[:-1].isdigit():
+        raise ValueError(f"Invalid trending window: {window!r}")
+    return int(window[:-1]) * WINDOW_UNITS[window[-1]]
+
+
+def load_vocabulary(spec: Optional[str] = None) -> Dict[Tuple[str, ...], str]:
+    """
+    Vocabulary of tracked terms: token n-gram -> display label
+
+    `spec` is a comma-separated term list, or `@/path/to/file` with one term
+    per line. Multi-word and hyphenated terms ("zero-day", "supply chain")
+    are matched as n-grams.
+    """
+    spec = spec or os.getenv("TRENDING_VOCABULARY") or DEFAULT_VOCABULARY
+    if spec.startswith("@"):
+        with open(spec[1:], encoding="utf-8") as f:
+            terms = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    else:
+        terms = [term.strip() for term in spec.split(",") if term.strip()]
+
+    vocabulary = {}
+    for term in terms:
+        tokens = tuple(tokenize(term))
+        if tokens:
+            vocabulary[tokens] = term.lower()
+    return vocabulary
+
+
+class TrendingCounter:
+    """
+    Streaming keyword counts over sliding time windows
+
+    Articles are counted once, when ingested, into the time bucket of their
+    publish time. Each window keeps running per-category totals; as buckets
+    slide out of a window their counts are subtracted again, so nothing ever
+    rescans the article list. Top-k answers are memoized until the counts
+    change.
+    """
+
+    def __init__(self, vocabulary: Optional[Dict[Tuple[str, ...], str]] = None,
+                 windows: Optional[Iterable[str]] = None, bucket_seconds: int = 300):
+        self.vocabulary = vocabulary if vocabulary is not None else load_vocabulary()
+        self.max_n = max((len(tokens) for tokens in self.vocabulary), default=1)
+        self.bucket_seconds = bucket_seconds
+        self.windows = {
+            window.strip(): parse_window(window)
+            for window in (windows or os.getenv("TRENDING_WINDOWS", "1h,24h,7d").split(","))
+        }
+        self._longest = max(self.windows, key=self.windows.get)
+
+        # bucket index -> category -> term counts, plus the sorted indexes
+        self._buckets: Dict[int, Dict[str, Counter]] = {}
+        self._bucket_order: List[int] = []
+        # window -> category -> running term totals
+        self._totals: Dict[str, Dict[str, Counter]] = {window: {} for window in self.windows}
+        # window -> oldest bucket index still counted
+        self._floors: Dict[str, int] = {window: 0 for window in self.windows}
+        # Article ids and title fingerprints already counted -> (bucket, source)
+        self._seen: Dict[str, Tuple[int, str]] = {}
+        self._seen_by_bucket: Dict[int, List[str]] = {}
+
+        self.version = 0
+        self._top_cache: Dict[Tuple[str, Tuple[str, ...], int], List[Tuple[str, int]]] = {}
+        self._top_version = 0
+
+    def terms(self, text: str) -> Counter:
+        """Vocabulary n-grams occurring in a piece of text"""
+        tokens = tokenize(text)
+        found = Counter()
+        for n in range(1, self.max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                label = self.vocabulary.get(tuple(tokens[i:i + n]))
+                if label:
+                    found[label] += 1
+        return found
+
+    def _bucket(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+
+    def _floor(self, window: str, now: float) -> int:
+        return self._bucket(now - self.windows[window]) + 1
+
+    def add(self, article: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """Count an article's title; returns False if it was already counted or is too old"""
+        now = now or time.time()
+        self.advance(now)
+
+        # A title fingerprint only marks a copy when another source counted it;
+        # one source reusing a headline is publishing a new post
+        source = article.get("source", "")
+        identities = [key for key in (article.get("id"), article.get("fingerprint")) if key]
+        if article.get("id") in self._seen:
+            return False
+        owner = self._seen.get(article.get("fingerprint"))
+        if owner and owner[1] != source:
+            return False
+
+        # Future-dated entries count as published now
+        ts = min(article.get("published_ts") or now, now)
+        bucket = self._bucket(ts)
+        if bucket < self._floor(self._longest, now):
+            return False
+
+        found = self.terms(article.get("title", ""))
+        category = article.get("category", "")
+
+        if bucket not in self._buckets:
+            self._buckets[bucket] = {}
+            bisect.insort(self._bucket_order, bucket)
+        self._buckets[bucket].setdefault(category, Counter()).update(found)
+        for key in identities:
+            if key not in self._seen:
+                self._seen[key] = (bucket, source)
+                self._seen_by_bucket.setdefault(bucket, []).append(key)
+
+        if found:
+            for window, totals in self._totals.items():
+                if bucket >= self._floors[window]:
+                    totals.setdefault(category, Counter()).update(found)
+            self.version += 1
+        return True
+
+    def add_many(self, articles: Iterable[Dict[str, Any]], now: Optional[float] = None) -> int:
+        now = now or time.time()
+        return sum(self.add(article, now) for article in articles)
+
+    def advance(self, now: Optional[float] = None):
+        """Slide every window forward, subtracting buckets that fell out of it"""
+        now = now or time.time()
+        changed = False
+        for window, totals in self._totals.items():
+            floor = self._floor(window, now)
+            old_floor = self._floors[window]
+            if floor <= old_floor:
+                continue
+            start = bisect.bisect_left(self._bucket_order, old_floor)
+            end = bisect.bisect_left(self._bucket_order, floor)
+            for bucket in self._bucket_order[start:end]:
+                for category, counts in self._buckets[bucket].items():
+                    if counts:
+                        totals[category].subtract(counts)
+                        changed = True
+            # Keep only terms still present so top-k scans stay small
+            for category in totals:
+                totals[category] = +totals[category]
+            self._floors[window] = floor
+
+        # Drop buckets that have left even the longest window
+        expired = bisect.bisect_left(self._bucket_order, self._floor(self._longest, now))
+        for bucket in self._bucket_order[:expired]:
+            del self._buckets[bucket]
+            for key in self._seen_by_bucket.pop(bucket, ()):
+                self._seen.pop(key, None)
+        del self._bucket_order[:expired]
+
+        if changed:
+            self.version += 1
+
+    def top(self, window: str, categories: Iterable[str], k: int = 10,
+            now: Optional[float] = None) -> List[Tuple[str, int]]:
+        """The k most frequent terms in a window across the given categories"""
+        if window not in self.windows:
+            raise ValueError(f"Unknown trending window: {window!r}")
+        self.advance(now)
+        if self._top_version != self.version:
+            self._top_cache.clear()
+            self._top_version = self.version
+
+        cache_key = (window, tuple(sorted(categories)), k)
+        cached = self._top_cache.get(cache_key)
+        if cached is None:
+            totals = self._totals[window]
+            combined = Counter()
+            for category in cache_key[1]:
+                combined.update(totals.get(category, ()))
+            cached = self._top_cache[cache_key] = heapq.nlargest(
+                k, combined.items(), key=lambda item: item[1]
+            )
+        return cached
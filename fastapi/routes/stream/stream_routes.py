@@ -0,0 +1,78 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+import os
+from core.events import event_broker, encode_sse
+
+
+router = APIRouter()
+
+MAX_SUBSCRIBERS = int(os.getenv("STREAM_MAX_SUBSCRIBERS", "2000"))
+QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "64"))
+HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+
+VALID_TOPICS = {"feed", "weather"}
+VALID_CATEGORIES = {"security", "tech", "devops"}
+
+
+async def _event_stream(request: Request, subscription):
+    try:
+        yield encode_sse("ready", {"topics": sorted(subscription.topics)})
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Comment frame keeps proxies from closing an idle connection
+                frame = b": ping\n\n"
+            yield frame
+    finally:
+        event_broker.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_updates(
+    request: Request,
+    topics: Optional[str] = Query(
+        default="feed,weather",
+        description="Comma-separated topics to subscribe to (feed, weather)"
+    ),
+    categories: Optional[str] = Query(
+        default=None,
+        description="Comma-separated feed categories to receive (default: all)"
+    )
+):
+    """
+    Server-Sent Events stream of new articles and changed weather readings
+
+    - **topics**: feed, weather (default: both)
+    - **categories**: Only push articles from these categories (security, tech, devops)
+
+    Events: `articles` (new articles for one category), `weather` (a changed
+    reading), `resync` (the client fell behind and should refetch), plus
+    periodic `: ping` comments.
+    """
+    topic_set = {topic.strip() for topic in topics.split(",") if topic.strip() in VALID_TOPICS}
+    if not topic_set:
+        raise HTTPException(status_code=400, detail="No valid topics requested")
+
+    keys = None
+    if categories:
+        keys = {cat.strip() for cat in categories.split(",") if cat.strip() in VALID_CATEGORIES}
+        if not keys:
+            raise HTTPException(status_code=400, detail="No valid categories requested")
+
+    if event_broker.subscriber_count >= MAX_SUBSCRIBERS:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers")
+
+    subscription = event_broker.subscribe(topic_set, keys, maxsize=QUEUE_SIZE)
+    return StreamingResponse(
+        _event_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Let nginx flush events immediately
+        }
+    )
@@ -1,12 +1,40 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from datetime import date
+import os
+from core.conditional import make_etag, version_etag, cache_control
+from core.responses import cached_json
 from .weather_service import WeatherService
 
 
 router = APIRouter()
 weather_service = WeatherService()
 
+MAX_BATCH_ITEMS = int(os.getenv("WEATHER_BATCH_MAX_ITEMS", "50"))
+
+# Readings are cached upstream for CACHE_TTL_WEATHER; clients and nginx may
+# reuse a response this long before revalidating it with If-None-Match
+WEATHER_CACHE_CONTROL = cache_control(int(os.getenv("CACHE_CONTROL_MAX_AGE_WEATHER", "60")))
+
+
+def _reading_version(reading: Dict[str, Any]) -> Any:
+    """
+    What identifies a reading in an ETag: its fetch time
+    
+    Mock readings are regenerated, with a new last_updated, on every call
+    but otherwise only change with the date (forecast days), so they are
+    identified by that instead.
+    """
+    if reading.get("source") == "mock":
+        return ("mock", date.today().isoformat())
+    return reading.get("last_updated")
+
+
+def _reading_times(readings: Dict[str, Dict[str, Any]]) -> List[Any]:
+    """Versions identifying each cached reading, for ETags"""
+    return [(key, _reading_version(reading)) for key, reading in readings.items()]
+
 
 class WeatherResponse(BaseModel):
     city: str
@@ -57,6 +85,7 @@ class ForecastResponse(BaseModel):
 
 @router.get("/weather", response_model=WeatherResponse)
 async def get_current_weather(
+    request: Request,
     city: str = Query(default="London", description="City name"),
     country: str = Query(default="GB", description="Country code (ISO 3166)")
 ):
@@ -68,13 +97,19 @@ async def get_current_weather(
     """
     try:
         weather_data = await weather_service.get_weather_data(city, country)
-        return WeatherResponse(**weather_data)
+        etag = make_etag("weather", city, country, _reading_version(weather_data))
+        
+        async def build():
+            return WeatherResponse(**weather_data)
+        
+        return await cached_json(request, etag, WEATHER_CACHE_CONTROL, build)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch weather data: {str(e)}")
 
 
 @router.get("/weather/forecast", response_model=ForecastResponse)
 async def get_weather_forecast(
+    request: Request,
     city: str = Query(default="London", description="City name"),
     country: str = Query(default="GB", description="Country code (ISO 3166)"),
     days: int = Query(default=5, ge=1, le=5, description="Number of forecast days (1-5)")
@@ -88,13 +123,18 @@ async def get_weather_forecast(
     """
     try:
         forecast_data = await weather_service.get_forecast_data(city, country, days)
-        return ForecastResponse(**forecast_data)
+        etag = make_etag("forecast", city, country, days, _reading_version(forecast_data))
+        
+        async def build():
+            return ForecastResponse(**forecast_data)
+        
+        return await cached_json(request, etag, WEATHER_CACHE_CONTROL, build)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch forecast data: {str(e)}")
 
 
 @router.get("/weather/local/{location}", response_model=LocalWeatherResponse)
-async def get_local_weather(location: str):
+async def get_local_weather(location: str, request: Request):
     """
     Get current weather for predefined local locations using Open-Meteo API
     
@@ -102,7 +142,12 @@ async def get_local_weather(location: str):
     """
     try:
         weather_data = await weather_service.get_local_weather(location)
-        return LocalWeatherResponse(**weather_data)
+        etag = make_etag("local", location, _reading_version(weather_data))
+        
+        async def build():
+            return LocalWeatherResponse(**weather_data)
+        
+        return await cached_json(request, etag, WEATHER_CACHE_CONTROL, build)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -110,40 +155,109 @@ async def get_local_weather(location: str):
 
 
 @router.get("/weather/local")
-async def get_all_local_weather():
+async def get_all_local_weather(request: Request):
     """
     Get current weather for all predefined local locations
     """
     try:
-        locations = ["san_bernardino", "hesperia"]
-        weather_data = {}
+        weather_data = await weather_service.get_all_local_weather()
+        etag = make_etag("local", _reading_times(weather_data))
         
-        for location in locations:
-            weather_data[location] = await weather_service.get_local_weather(location)
+        async def build():
+            return {"locations": weather_data}
         
-        return {"locations": weather_data}
+        return await cached_json(request, etag, WEATHER_CACHE_CONTROL, build)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch local weather data: {str(e)}")
 
 
+@router.get("/weather/batch")
+async def get_weather_batch(
+    request: Request,
+    locations: Optional[str] = Query(
+        default=None,
+        description="Comma-separated predefined location keys (san_bernardino, hesperia)"
+    ),
+    cities: Optional[str] = Query(
+        default=None,
+        description="Semicolon-separated City,CC pairs, e.g. London,GB;Paris,FR"
+    ),
+    coords: Optional[str] = Query(
+        default=None,
+        description="Semicolon-separated lat,lon pairs, e.g. 34.1083,-117.2898;34.4264,-117.3001"
+    )
+):
+    """
+    Get current weather for many places in one call
+    
+    - **locations**: Predefined location keys
+    - **cities**: City,CC pairs (OpenWeatherMap)
+    - **coords**: Latitude,longitude pairs (Open-Meteo)
+    
+    Lookups run concurrently; Open-Meteo lookups share one upstream request.
+    At most WEATHER_BATCH_MAX_ITEMS places per call.
+    """
+    location_list = [key.strip() for key in (locations or "").split(",") if key.strip()]
+    try:
+        city_list = []
+        for pair in (cities or "").split(";"):
+            if pair.strip():
+                city, country = pair.split(",")
+                city_list.append((city.strip(), country.strip().upper()))
+        coordinate_list = []
+        for pair in (coords or "").split(";"):
+            if pair.strip():
+                latitude, longitude = pair.split(",")
+                coordinate_list.append((round(float(latitude), 4), round(float(longitude), 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="cities must be City,CC pairs and coords lat,lon pairs")
+    
+    count = len(location_list) + len(city_list) + len(coordinate_list)
+    if count == 0:
+        raise HTTPException(status_code=400, detail="Provide at least one of locations, cities or coords")
+    if count > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ITEMS} places per batch")
+    
+    try:
+        batch = await weather_service.get_weather_batch(location_list, city_list, coordinate_list)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch batch weather data: {str(e)}")
+    
+    etag = make_etag(
+        "batch",
+        _reading_times(batch["locations"]),
+        _reading_times(batch["cities"]),
+        _reading_times(batch["coordinates"]),
+        sorted(batch["errors"].items())
+    )
+    
+    async def build():
+        return batch
+    
+    return await cached_json(request, etag, WEATHER_CACHE_CONTROL, build)
+
+
 @router.get("/weather/cities")
-async def get_popular_cities():
+async def get_popular_cities(request: Request):
     """
     Get a list of popular cities for weather lookup
     """
-    return {
-        "cities": [
-            {"name": "London", "country": "GB", "code": "london,gb"},
-            {"name": "New York", "country": "US", "code": "new-york,us"},
-            {"name": "Tokyo", "country": "JP", "code": "tokyo,jp"},
-            {"name": "Sydney", "country": "AU", "code": "sydney,au"},
-            {"name": "Berlin", "country": "DE", "code": "berlin,de"},
-            {"name": "Paris", "country": "FR", "code": "paris,fr"},
-            {"name": "Toronto", "country": "CA", "code": "toronto,ca"},
-            {"name": "Amsterdam", "country": "NL", "code": "amsterdam,nl"}
-        ],
-        "local_locations": [
-            {"name": "San Bernardino, CA", "code": "san_bernardino"},
-            {"name": "Hesperia, CA", "code": "hesperia"}
-        ]
-    }
\ No newline at end of file
+    async def build():
+        return {
+            "cities": [
+                {"name": "London", "country": "GB", "code": "london,gb"},
+                {"name": "New York", "country": "US", "code": "new-york,us"},
+                {"name": "Tokyo", "country": "JP", "code": "tokyo,jp"},
+                {"name": "Sydney", "country": "AU", "code": "sydney,au"},
+                {"name": "Berlin", "country": "DE", "code": "berlin,de"},
+                {"name": "Paris", "country": "FR", "code": "paris,fr"},
+                {"name": "Toronto", "country": "CA", "code": "toronto,ca"},
+                {"name": "Amsterdam", "country": "NL", "code": "amsterdam,nl"}
+            ],
+            "local_locations": [
+                {"name": "San Bernardino, CA", "code": "san_bernardino"},
+                {"name": "Hesperia, CA", "code": "hesperia"}
+            ]
+        }
+    
+    return await cached_json(request, version_etag(0, "cities"), WEATHER_CACHE_CONTROL, build)
@@ -1,8 +1,95 @@
 import httpx
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 import asyncio
+import logging
+from core.http_client import http_client
+from core.cache import LRUCache, SWRCache
+from core.cache_backends import cache_backend
+from core.events import event_broker
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+WEATHER_FALLBACKS = metrics.counter(
+    "weather_mock_fallbacks_total",
+    "Weather lookups answered with mock data because the upstream fetch failed",
+    ["family"]
+)
+
+
+class OpenMeteoBatcher:
+    """
+    Coalesces concurrent current-weather lookups into one Open-Meteo request
+    
+    Open-Meteo accepts comma-separated latitude/longitude lists and answers
+    with one result per coordinate pair, so lookups that arrive within
+    `window` seconds of each other (up to `max_batch`) share a single
+    upstream round trip.
+    """
+    
+    api_url = "https://api.open-meteo.com/v1/forecast"
+    
+    def __init__(self, window: Optional[float] = None, max_batch: Optional[int] = None):
+        self.window = window if window is not None else float(os.getenv("WEATHER_BATCH_WINDOW_MS", "5")) / 1000
+        self.max_batch = max_batch or int(os.getenv("WEATHER_BATCH_MAX", "50"))
+        self._pending: List[Tuple[float, float, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._requests_in_flight = set()
+    
+    async def current(self, latitude: float, longitude: float) -> Dict[str, Any]:
+        """Open-Meteo `current_weather` block for one coordinate pair"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((latitude, longitude, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+    
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        self._flush()
+    
+    def _flush(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._fetch(batch))
+            self._requests_in_flight.add(task)
+            task.add_done_callback(self._requests_in_flight.discard)
+    
+    async def _fetch(self, batch: List[Tuple[float, float, asyncio.Future]]):
+        try:
+            response = await http_client.get(self.api_url, params={
+                "latitude": ",".join(str(latitude) for latitude, _, _ in batch),
+                "longitude": ",".join(str(longitude) for _, longitude, _ in batch),
+                "current_weather": True,
+                "temperature_unit": "fahrenheit",
+                "windspeed_unit": "kmh",
+                "timezone": "auto"
+            })
+            response.raise_for_status()
+            data = response.json()
+            # A single coordinate pair comes back as an object, several as a list
+            results = data if isinstance(data, list) else [data]
+            if len(results) != len(batch):
+                raise ValueError(f"Open-Meteo returned {len(results)} results for {len(batch)} locations")
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result.get("current_weather", {}))
+
+
+open_meteo = OpenMeteoBatcher()
 
 
 class WeatherClient:
@@ -12,26 +99,13 @@ class WeatherClient:
         self.latitude = latitude
         self.longitude = longitude
         self.location_name = location_name
-        self.api_url = "https://api.open-meteo.com/v1/forecast"
         self._cache = {}
         self._cache_duration = timedelta(minutes=10)
 
     async def get_current_weather(self) -> Dict[str, Any]:
-        """Fetch current weather data from Open-Meteo API"""
-        params = {
-            "latitude": self.latitude,
-            "longitude": self.longitude,
-            "current_weather": True,
-            "temperature_unit": "fahrenheit",
-            "windspeed_unit": "kmh",
-            "timezone": "auto"
-        }
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(self.api_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return self._transform_current_weather(data.get("current_weather", {}))
+        """Fetch current weather data from Open-Meteo API (batched with concurrent lookups)"""
+        current = await open_meteo.current(self.latitude, self.longitude)
+        return self._transform_current_weather(current)
 
     def _transform_current_weather(self, weather_data: Dict[str, Any]) -> Dict[str, Any]:
         """Transform Open-Meteo response to standardized format"""
@@ -70,8 +144,30 @@ class WeatherService:
     def __init__(self):
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
         self.openweather_base_url = "https://api.openweathermap.org/data/2.5"
-        self._cache = {}
-        self._cache_duration = timedelta(minutes=10)
+        
+        # Fresh for CACHE_TTL_WEATHER, then served stale while revalidating;
+        # the last good reading is kept for CACHE_MAX_AGE_WEATHER to ride out
+        # upstream outages, retrying upstream every CACHE_RETRY_AFTER_WEATHER
+        # meanwhile. Bounded because keys come from user-supplied cities.
+        self._cache = SWRCache(
+            fresh_ttl=float(os.getenv("CACHE_TTL_WEATHER", "600")),
+            stale_ttl=float(os.getenv("CACHE_STALE_TTL_WEATHER", "3600")),
+            max_age=float(os.getenv("CACHE_MAX_AGE_WEATHER", "86400")),
+            max_entries=int(os.getenv("CACHE_MAX_ENTRIES_WEATHER", "512")),
+            name="weather",
+            backend=cache_backend,
+            retry_after=float(os.getenv("CACHE_RETRY_AFTER_WEATHER", "30"))
+        )
+        
+        # Last reading pushed per cache key, so stream subscribers only hear
+        # about readings that actually changed
+        self._readings = LRUCache(max_entries=512, name="weather-readings")
+        self._push_interval = float(os.getenv("WEATHER_PUSH_INTERVAL", os.getenv("CACHE_TTL_WEATHER", "600")))
+        self._push_task: Optional[asyncio.Task] = None
+        
+        # City lookups are one upstream request each; bound how many a single
+        # batch call runs at once (Open-Meteo lookups are coalesced instead)
+        self._batch_concurrency = int(os.getenv("WEATHER_BATCH_CONCURRENCY", "8"))
         
         # Predefined locations for San Bernardino and Hesperia
         self.locations = {
@@ -106,24 +202,111 @@ class WeatherService:
             raise ValueError(f"Unknown location: {location_key}")
         
         cache_key = f"local_{location_key}"
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]["data"]
-        
         try:
-            weather_data = await client.get_current_weather()
-            
-            # Cache the result
-            self._cache[cache_key] = {
-                "data": weather_data,
-                "timestamp": datetime.utcnow()
-            }
-            
-            return weather_data
+            return await self._cache.get_or_fetch(
+                cache_key, lambda: self._fetch_and_publish(cache_key, client.get_current_weather),
+                family="local"
+            )
         except Exception as e:
-            return self._get_mock_weather_data(location_key)
+            logger.error(f"Error fetching local weather for {location_key}: {e}")
+            WEATHER_FALLBACKS.inc(family="local")
+            return self._get_mock_local_weather_data(location_key)
 
-    def _get_mock_weather_data(self, location_key: str) -> Dict[str, Any]:
-        """Return mock weather data when API is unavailable"""
+    async def get_coordinates_weather(self, latitude: float, longitude: float) -> Dict[str, Any]:
+        """Get weather for an arbitrary coordinate pair using Open-Meteo"""
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError(f"Invalid coordinates: {latitude},{longitude}")
+        
+        name = f"{latitude:.4f},{longitude:.4f}"
+        client = WeatherClient(latitude=latitude, longitude=longitude, location_name=name)
+        cache_key = f"coords_{name}"
+        try:
+            return await self._cache.get_or_fetch(
+                cache_key, lambda: self._fetch_and_publish(cache_key, client.get_current_weather),
+                family="coords"
+            )
+        except Exception as e:
+            logger.error(f"Error fetching weather for {name}: {e}")
+            WEATHER_FALLBACKS.inc(family="coords")
+            mock = self._get_mock_local_weather_data(name)
+            mock.update({"latitude": latitude, "longitude": longitude})
+            return mock
+    
+    async def get_all_local_weather(self) -> Dict[str, Dict[str, Any]]:
+        """Get weather for every predefined location concurrently"""
+        results = await asyncio.gather(*(self.get_local_weather(key) for key in self.locations))
+        return dict(zip(self.locations, results))
+    
+    async def get_weather_batch(self, locations: List[str] = None, cities: List[Tuple[str, str]] = None,
+                                coordinates: List[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """
+        Get weather for many places in one call
+        
+        Every lookup runs concurrently. Predefined locations and coordinates
+        go to Open-Meteo, where concurrent lookups are coalesced into a single
+        multi-coordinate request; city lookups (OpenWeatherMap) are one
+        request each, at most WEATHER_BATCH_CONCURRENCY at a time. Lookups
+        that cannot be answered are reported under "errors".
+        """
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
+        
+        async def city_weather(city: str, country_code: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_weather_data(city, country_code)
+        
+        lookups = {}
+        for key in dict.fromkeys(locations or []):
+            lookups[("locations", key)] = self.get_local_weather(key)
+        for city, country_code in dict.fromkeys(cities or []):
+            lookups[("cities", f"{city},{country_code}")] = city_weather(city, country_code)
+        for latitude, longitude in dict.fromkeys(coordinates or []):
+            lookups[("coordinates", f"{latitude},{longitude}")] = self.get_coordinates_weather(latitude, longitude)
+        
+        results = await asyncio.gather(*lookups.values(), return_exceptions=True)
+        
+        response = {"locations": {}, "cities": {}, "coordinates": {}, "errors": {}}
+        for (group, key), result in zip(lookups, results):
+            if isinstance(result, Exception):
+                response["errors"][key] = str(result)
+            else:
+                response[group][key] = result
+        return response
+    
+    async def _fetch_and_publish(self, cache_key: str, fetch) -> Dict[str, Any]:
+        """Run a fetch and push the reading to stream subscribers if it changed"""
+        data = await fetch()
+        reading = {k: v for k, v in data.items() if k != "last_updated"}
+        if self._readings.peek(cache_key) != reading:
+            self._readings.set(cache_key, reading)
+            event_broker.publish("weather", "weather", {"key": cache_key, "weather": data})
+        return data
+    
+    def start(self):
+        """Keep local readings revalidating while anyone is streaming weather"""
+        if self._push_task is None:
+            self._push_task = asyncio.create_task(self._push_local_weather())
+    
+    async def stop(self):
+        if self._push_task is not None:
+            self._push_task.cancel()
+            await asyncio.gather(self._push_task, return_exceptions=True)
+            self._push_task = None
+    
+    async def _push_local_weather(self):
+        while True:
+            await asyncio.sleep(self._push_interval)
+            if not event_broker.has_subscribers("weather"):
+                continue
+            # Stale entries are served immediately and revalidated in the
+            # background; the revalidation is what publishes a change
+            for location_key in self.locations:
+                try:
+                    await self.get_local_weather(location_key)
+                except Exception as e:
+                    logger.warning(f"Background weather refresh failed for {location_key}: {e}")
+    
+    def _get_mock_local_weather_data(self, location_key: str) -> Dict[str, Any]:
+        """Return mock local weather data when API is unavailable"""
         location_name = self.locations.get(location_key, {}).get("name", location_key)
         return {
             "location": location_name,
@@ -138,17 +321,6 @@ class WeatherService:
             "source": "mock"
         }
 
-    def _is_cache_valid(self, city: str) -> bool:
-        """Check if cached data is still valid"""
-        if city not in self._cache:
-            return False
-        
-        cached_time = self._cache[city].get("timestamp")
-        if not cached_time:
-            return False
-            
-        return datetime.utcnow() - cached_time < self._cache_duration
-    
     async def get_weather_data(self, city: str = "London", country_code: str = "GB") -> Dict[str, Any]:
         """
         Get current weather data for a city
@@ -156,45 +328,41 @@ class WeatherService:
         """
         cache_key = f"{city},{country_code}"
         
-        # Return cached data if valid
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]["data"]
-        
         # If no API key, return mock data
         if not self.api_key:
             return self._get_mock_weather_data(city)
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/weather",
-                    params={
-                        "q": f"{city},{country_code}",
-                        "appid": self.api_key,
-                        "units": "metric"
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                # Transform API response to our format
-                weather_data = self._transform_weather_data(data)
-                
-                # Cache the result
-                self._cache[cache_key] = {
-                    "data": weather_data,
-                    "timestamp": datetime.utcnow()
-                }
-                
-                return weather_data
-                
+            return await self._cache.get_or_fetch(
+                cache_key, lambda: self._fetch_and_publish(
+                    cache_key, lambda: self._fetch_weather_data(city, country_code)
+                ),
+                family="city"
+            )
         except httpx.HTTPError as e:
-            print(f"HTTP error fetching weather data: {e}")
+            logger.error(f"HTTP error fetching weather data for {city},{country_code}: {e}")
+            WEATHER_FALLBACKS.inc(family="city")
             return self._get_mock_weather_data(city)
         except Exception as e:
-            print(f"Error fetching weather data: {e}")
+            logger.error(f"Error fetching weather data for {city},{country_code}: {e}")
+            WEATHER_FALLBACKS.inc(family="city")
             return self._get_mock_weather_data(city)
     
+    async def _fetch_weather_data(self, city: str, country_code: str) -> Dict[str, Any]:
+        """Fetch current weather from OpenWeatherMap (raises on failure)"""
+        response = await http_client.get(
+            f"{self.openweather_base_url}/weather",
+            params={
+                "q": f"{city},{country_code}",
+                "appid": self.api_key,
+                "units": "metric"
+            }
+        )
+        response.raise_for_status()
+        
+        # Transform API response to our format
+        return self._transform_weather_data(response.json())
+    
     def _transform_weather_data(self, api_data: Dict[str, Any]) -> Dict[str, Any]:
         """Transform OpenWeatherMap API response to our format"""
         return {
@@ -239,48 +407,42 @@ class WeatherService:
         """
         Get weather forecast data
         """
-        cache_key = f"forecast_{city},{country_code}"
-        
-        # Return cached data if valid
-        if self._is_cache_valid(cache_key):
-            return self._cache[cache_key]["data"]
+        cache_key = f"forecast_{city},{country_code},{days}"
         
         # If no API key, return mock data
         if not self.api_key:
             return self._get_mock_forecast_data(city, days)
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/forecast",
-                    params={
-                        "q": f"{city},{country_code}",
-                        "appid": self.api_key,
-                        "units": "metric",
-                        "cnt": days * 8  # 8 forecasts per day (3-hour intervals)
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                # Transform forecast data
-                forecast_data = self._transform_forecast_data(data, days)
-                
-                # Cache the result
-                self._cache[cache_key] = {
-                    "data": forecast_data,
-                    "timestamp": datetime.utcnow()
-                }
-                
-                return forecast_data
-                
+            return await self._cache.get_or_fetch(
+                cache_key, lambda: self._fetch_forecast_data(city, country_code, days),
+                family="forecast"
+            )
         except httpx.HTTPError as e:
-            print(f"HTTP error fetching forecast data: {e}")
+            logger.error(f"HTTP error fetching forecast data for {city},{country_code}: {e}")
+            WEATHER_FALLBACKS.inc(family="forecast")
             return self._get_mock_forecast_data(city, days)
         except Exception as e:
-            print(f"Error fetching forecast data: {e}")
+            logger.error(f"Error fetching forecast data for {city},{country_code}: {e}")
+            WEATHER_FALLBACKS.inc(family="forecast")
             return self._get_mock_forecast_data(city, days)
     
+    async def _fetch_forecast_data(self, city: str, country_code: str, days: int) -> Dict[str, Any]:
+        """Fetch forecast from OpenWeatherMap (raises on failure)"""
+        response = await http_client.get(
+            f"{self.openweather_base_url}/forecast",
+            params={
+                "q": f"{city},{country_code}",
+                "appid": self.api_key,
+                "units": "metric",
+                "cnt": days * 8  # 8 forecasts per day (3-hour intervals)
+            }
+        )
+        response.raise_for_status()
+        
+        # Transform forecast data
+        return self._transform_forecast_data(response.json(), days)
+    
     def _transform_forecast_data(self, api_data: Dict[str, Any], days: int) -> Dict[str, Any]:
         """Transform forecast API response"""
         daily_forecasts = []
@@ -0,0 +1,123 @@
+import time
+
+from routes.social.article_store import ArticleStore, order_key
+from routes.social.feed_parser import parse_feed, title_fingerprint
+
+NOW = time.time()
+
+
+def article(article_id, source, title, age, category="tech"):
+    return {
+        "id": article_id,
+        "digest": article_id,
+        "fingerprint": title_fingerprint(title),
+        "title": title or "No Title",
+        "description": "",
+        "url": article_id,
+        "source": source,
+        "category": category,
+        "published_ts": NOW - age,
+        "domain": ""
+    }
+
+
+def ids(articles):
+    return [a["id"] for a in articles]
+
+
+def test_syndicated_story_is_shown_once_under_first_source():
+    store = ArticleStore()
+    store.put("a", [article("https://a/1", "a", "Kubernetes 2.0 released", age=120)])
+    store.put("b", [
+        article("https://b/1", "b", "Released: Kubernetes 2.0!", age=60),
+        article("https://a/1", "b", "Kubernetes 2.0 is out", age=60)
+    ])
+
+    assert ids(store.page(["a", "b"], 10)[0]) == ["https://a/1"]
+    assert ids(store.page(["b"], 10)[0]) == []
+    assert store.is_duplicate("b", {"id": "https://b/1", "fingerprint": title_fingerprint("Kubernetes 2.0 released")})
+
+
+def test_duplicate_moves_to_next_source_when_owner_drops_it():
+    store = ArticleStore(retention=0, max_per_source=500, keep_latest=1)
+    store.put("a", [article("https://a/1", "a", "Kubernetes 2.0 released", age=600)])
+    store.put("b", [article("https://b/1", "b", "Kubernetes 2.0 released", age=300)])
+    store.put("a", [article("https://a/2", "a", "Something else", age=0)])
+
+    assert ids(store.page(["a", "b"], 10)[0]) == ["https://a/2", "https://b/1"]
+
+
+def test_recurring_title_within_one_source_is_kept():
+    store = ArticleStore()
+    store.put("a", [article("https://a/1", "a", "Weekly Security Roundup", age=7 * 86400)])
+    store.put("a", [article("https://a/2", "a", "Weekly Security Roundup", age=0)])
+
+    assert ids(store.page(["a"], 10)[0]) == ["https://a/2", "https://a/1"]
+    assert not store.is_duplicate("a", store.get("a")["articles"][0])
+
+
+def test_untitled_articles_are_not_deduplicated():
+    def feed(link):
+        return f"""<rss version="2.0"><channel><title>t</title>
+            <item><link>{link}</link><description>untitled</description></item>
+        </channel></rss>""".encode("utf-8")
+
+    store = ArticleStore()
+    store.put("a", parse_feed(feed("https://a.example/1"), {"name": "a", "category": "tech"}))
+    store.put("b", parse_feed(feed("https://b.example/1"), {"name": "b", "category": "tech"}))
+
+    articles = store.page(["a", "b"], 10)[0]
+    assert sorted(ids(articles)) == ["https://a.example/1", "https://b.example/1"]
+    assert {a["title"] for a in articles} == {"No Title"}
+
+
+def make_store():
+    store = ArticleStore(retention=30 * 86400, max_per_source=500)
+    # Interleaved publish times, with ties across sources
+    for source in ("a", "b", "c"):
+        store.put(source, [
+            article(f"https://{source}/{i}", source, f"{source} story {i}", age=(i // 2) * 60)
+            for i in range(25)
+        ])
+    return store
+
+
+def test_page_walks_every_article_once():
+    store = make_store()
+    expected = ids(store.iter_merged(["a", "b", "c"]))
+    assert len(expected) == 75
+
+    seen, before = [], None
+    while True:
+        page, has_more = store.page(["a", "b", "c"], 7, before=before)
+        seen.extend(ids(page))
+        if not has_more:
+            break
+        before = order_key(page[-1])
+
+    assert seen == expected
+
+
+def test_page_walks_back_up_with_nearest_after():
+    store = make_store()
+    expected = ids(store.iter_merged(["a", "b", "c"]))
+
+    seen, after = [], order_key(store.page(["a", "b", "c"], 75)[0][-1])
+    while True:
+        page, has_more = store.page(["a", "b", "c"], 7, after=after, nearest_after=True)
+        seen = ids(page) + seen
+        if not has_more:
+            break
+        after = order_key(page[0])
+
+    assert seen == expected[:-1]
+
+
+def test_page_is_stable_when_newer_articles_arrive():
+    store = make_store()
+    first, _ = store.page(["a", "b", "c"], 10)
+    store.put("a", [article("https://a/new", "a", "a breaking story", age=-30)])
+
+    second, _ = store.page(["a", "b", "c"], 10, before=order_key(first[-1]))
+    assert not set(ids(first)) & set(ids(second))
+    assert ids(store.page(["a", "b", "c"], 20)[0]) == ["https://a/new"] + ids(first) + ids(second)[:9]
@@ -0,0 +1,72 @@
+import asyncio
+import os
+
+import pytest
+
+from core.cache_backends import FileCacheBackend, MemoryCacheBackend, RedisCacheBackend, aioredis
+
+
+def memory_backend(tmp_path):
+    return MemoryCacheBackend()
+
+
+def file_backend(tmp_path):
+    return FileCacheBackend(str(tmp_path / "cache"))
+
+
+def redis_backend(tmp_path):
+    url = os.getenv("CACHE_TEST_REDIS_URL")
+    if aioredis is None or not url:
+        pytest.skip("needs the redis package and CACHE_TEST_REDIS_URL")
+    return RedisCacheBackend(url, prefix=f"k8s-dashboard-tests:{tmp_path.name}:")
+
+
+@pytest.mark.parametrize("make_backend", [memory_backend, file_backend, redis_backend])
+def test_set_get_delete(tmp_path, make_backend):
+    backend = make_backend(tmp_path)
+
+    async def scenario():
+        try:
+            assert await backend.get("weather:london,gb") is None
+            await backend.set("weather:london,gb", {"value": 18, "stored_at": 1.5}, ttl=60)
+            assert await backend.get("weather:london,gb") == {"value": 18, "stored_at": 1.5}
+
+            await backend.delete("weather:london,gb")
+            assert await backend.get("weather:london,gb") is None
+            # Deleting a missing key is not an error
+            await backend.delete("weather:london,gb")
+        finally:
+            await backend.close()
+    asyncio.run(scenario())
+
+
+def cache_files(backend):
+    return [name for name in os.listdir(backend.directory) if name.endswith(".json")]
+
+
+def test_file_backend_deletes_expired_entries_on_read(tmp_path):
+    backend = FileCacheBackend(str(tmp_path))
+
+    async def scenario():
+        await backend.set("weather:paris,fr", {"value": 1}, ttl=0.01)
+        await asyncio.sleep(0.02)
+        assert await backend.get("weather:paris,fr") is None
+    asyncio.run(scenario())
+    assert cache_files(backend) == []
+
+
+def test_file_backend_stays_within_max_entries(tmp_path):
+    backend = FileCacheBackend(str(tmp_path), max_entries=5)
+
+    async def scenario():
+        await backend.incr("feed:generation")
+        for i in range(200):
+            await backend.set(f"weather:city{i},gb", {"value": i}, ttl=3600)
+    asyncio.run(scenario())
+
+    assert len(cache_files(backend)) < 5 + backend._SWEEP_EVERY
+    backend.trim()
+    assert len(cache_files(backend)) == 5
+    # Counters have no TTL and are never evicted
+    assert asyncio.run(backend.get("feed:generation")) == 1
+    assert asyncio.run(backend.get("weather:city199,gb")) == {"value": 199}
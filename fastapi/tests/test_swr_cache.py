@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import pytest
+
+from core.cache import SWRCache
+
+
+class Upstream:
+    """Fake fetch that counts calls and can be taken down"""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.value = "v1"
+        self.down = False
+        self.delay = delay
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.down:
+            raise RuntimeError("upstream down")
+        return self.value
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_fresh_entry_is_served_without_fetching():
+    async def scenario():
+        cache, upstream = SWRCache(fresh_ttl=60, stale_ttl=60), Upstream()
+        assert await cache.get_or_fetch("London", upstream.fetch) == "v1"
+        upstream.value = "v2"
+        assert await cache.get_or_fetch(" london ", upstream.fetch) == "v1"
+        assert upstream.calls == 1
+    run(scenario())
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def scenario():
+        cache, upstream = SWRCache(fresh_ttl=60, stale_ttl=60), Upstream(delay=0.05)
+        values = await asyncio.gather(*(cache.get_or_fetch("k", upstream.fetch) for _ in range(10)))
+        assert values == ["v1"] * 10
+        assert upstream.calls == 1
+    run(scenario())
+
+
+def test_stale_entry_is_served_while_revalidating():
+    async def scenario():
+        cache, upstream = SWRCache(fresh_ttl=0.05, stale_ttl=60), Upstream()
+        await cache.get_or_fetch("k", upstream.fetch)
+        await asyncio.sleep(0.06)
+        upstream.value = "v2"
+
+        assert await cache.get_or_fetch("k", upstream.fetch) == "v1"
+        await asyncio.sleep(0.01)
+        assert await cache.get_or_fetch("k", upstream.fetch) == "v2"
+        assert upstream.calls == 2
+    run(scenario())
+
+
+def test_failed_load_without_a_value_raises():
+    async def scenario():
+        cache, upstream = SWRCache(fresh_ttl=60, stale_ttl=60), Upstream()
+        upstream.down = True
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("k", upstream.fetch)
+    run(scenario())
+
+
+def test_outage_serves_last_good_value_without_waiting_on_upstream():
+    async def scenario():
+        cache = SWRCache(fresh_ttl=0.05, stale_ttl=0.05, max_age=60, retry_after=0.2)
+        upstream = Upstream()
+        await cache.get_or_fetch("k", upstream.fetch)
+
+        # Past the stale window: the first request waits on the failing load once
+        await asyncio.sleep(0.11)
+        upstream.down, upstream.delay = True, 0.1
+        assert await cache.get_or_fetch("k", upstream.fetch) == "v1"
+        assert upstream.calls == 2
+
+        # Later requests get the held value straight back and leave upstream alone
+        started = time.perf_counter()
+        for _ in range(20):
+            assert await cache.get_or_fetch("k", upstream.fetch) == "v1"
+        assert time.perf_counter() - started < 0.05
+        assert upstream.calls == 2
+
+        # After retry_after, one background revalidation tries again
+        await asyncio.sleep(0.2)
+        upstream.down = False
+        upstream.value = "v2"
+        assert await cache.get_or_fetch("k", upstream.fetch) == "v1"
+        await asyncio.sleep(0.15)
+        assert await cache.get_or_fetch("k", upstream.fetch) == "v2"
+        assert upstream.calls == 3
+    run(scenario())
+
+
+def test_held_value_still_expires_after_max_age():
+    async def scenario():
+        cache = SWRCache(fresh_ttl=0.05, stale_ttl=0.05, max_age=0.3, retry_after=1)
+        upstream = Upstream()
+        await cache.get_or_fetch("k", upstream.fetch)
+
+        await asyncio.sleep(0.11)
+        upstream.down = True
+        assert await cache.get_or_fetch("k", upstream.fetch) == "v1"
+
+        await asyncio.sleep(0.2)
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch("k", upstream.fetch)
+    run(scenario())
@@ -0,0 +1,43 @@
+import time
+
+from routes.social.feed_parser import title_fingerprint
+from routes.social.trending import TrendingCounter
+
+NOW = time.time()
+
+
+def article(article_id, source, title, age=0):
+    return {
+        "id": article_id,
+        "fingerprint": title_fingerprint(title),
+        "title": title,
+        "source": source,
+        "category": "security",
+        "published_ts": NOW - age
+    }
+
+
+def make_counter():
+    return TrendingCounter(vocabulary={("ransomware",): "ransomware"}, windows=["1h", "7d"])
+
+
+def test_article_is_counted_once():
+    counter = make_counter()
+    assert counter.add(article("https://a/1", "a", "Ransomware hits hospital"), NOW)
+    assert not counter.add(article("https://a/1", "a", "Ransomware hits hospital"), NOW)
+    assert counter.top("1h", ["security"], now=NOW) == [("ransomware", 1)]
+
+
+def test_syndicated_copy_is_not_counted_again():
+    counter = make_counter()
+    counter.add(article("https://a/1", "a", "Ransomware hits hospital"), NOW)
+    assert not counter.add(article("https://b/1", "b", "Hospital hits: ransomware"), NOW)
+    assert counter.top("1h", ["security"], now=NOW) == [("ransomware", 1)]
+
+
+def test_recurring_title_within_one_source_is_counted():
+    counter = make_counter()
+    counter.add(article("https://a/1", "a", "Weekly ransomware roundup", age=86400), NOW)
+    assert counter.add(article("https://a/2", "a", "Weekly ransomware roundup"), NOW)
+    assert counter.top("7d", ["security"], now=NOW) == [("ransomware", 2)]
+    assert counter.top("1h", ["security"], now=NOW) == [("ransomware", 1)]